@@ -3,11 +3,22 @@
 """
 import ast
 import os
-import re
-from typing import Dict, List, Set, Optional, Any
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
 
-from code_analyzer.ast_parser import analyze_python_file
-from utils.file_operations import read_file
+from .schema_extractor_core import (
+    CLASS_MARKER, ModelVisitor, SOURCE_FILTERS, find_db_var_name, get_cache_path,
+    load_cached_models, parse_and_extract, store_cached_models
+)
+
+# 候選文件數達到此門檻時才使用多行程解析，避免小專案負擔行程啟動成本
+_PARALLEL_MIN_FILES = 64
+
+# 通用（啟發式）提取時略過的目錄
+_GENERIC_SKIP_DIRS = frozenset({'.venv', 'venv', 'site-packages', 'migrations', '__pycache__'})
 
 
 class SchemaExtractor:
@@ -25,6 +36,113 @@ class SchemaExtractor:
         self.framework = framework
         self.models = []
         self.schemas = []
+        self._models_by_type: Dict[str, List[Dict[str, Any]]] = {}
+        self._relationships: Optional[List[Dict[str, Any]]] = None
+        self._py_files: Optional[List[str]] = None
+        self._source_cache: Dict[str, bytes] = {}
+        self._ast_cache: Dict[str, Optional[ast.Module]] = {}
+        
+    def _iter_py_files(self) -> Iterator[str]:
+        """
+        以 os.scandir 遍歷專案，逐一產生 Python 文件路徑
+        
+        路徑在遍歷過程中即時產生，讓處理與遍歷交錯進行；完整遍歷一次後
+        結果快取於實例上，各提取器共用同一次遍歷。
+        
+        Yields:
+            Python 文件路徑
+        """
+        if self._py_files is not None:
+            yield from self._py_files
+            return
+        
+        py_files = []
+        stack = [self.project_path]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            
+            sub_dirs = []
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    sub_dirs.append(entry.path)
+                elif entry.name.endswith('.py') and entry.is_file(follow_symlinks=False):
+                    py_files.append(entry.path)
+                    yield entry.path
+            
+            # 反向壓入堆疊，保持與 os.walk 相同的遍歷順序
+            stack.extend(reversed(sub_dirs))
+        
+        self._py_files = py_files
+    
+    def _iter_model_files(self, match: Callable[[str], bool]) -> Iterator[str]:
+        """
+        逐一產生符合條件的 Python 文件路徑
+        
+        Args:
+            match: 判斷文件路徑是否為候選文件的函數
+            
+        Yields:
+            符合條件的文件路徑
+        """
+        for file_path in self._iter_py_files():
+            if match(file_path):
+                yield file_path
+    
+    def _add_model(self, model: Dict[str, Any]) -> None:
+        """
+        添加模型並同步更新按類型分組的索引
+        
+        Args:
+            model: 模型資訊
+        """
+        self.models.append(model)
+        self._models_by_type.setdefault(model['type'], []).append(model)
+        self._relationships = None
+    
+    def _read_source(self, file_path: str) -> bytes:
+        """
+        讀取文件的原始位元組，同一次提取中每個文件只讀取一次
+        
+        內容保持未解碼狀態，只有通過過濾的文件才會交由 ast.parse 解碼。
+        
+        Args:
+            file_path: 文件路徑
+            
+        Returns:
+            文件內容（位元組）
+        """
+        content = self._source_cache.get(file_path)
+        if content is None:
+            with open(file_path, 'rb') as file:
+                content = file.read()
+            self._source_cache[file_path] = content
+        return content
+    
+    def _get_tree(self, file_path: str) -> Optional[ast.Module]:
+        """
+        解析文件為語法樹，同一次提取中每個文件只解析一次
+        
+        Args:
+            file_path: 文件路徑
+            
+        Returns:
+            語法樹，若文件無法解析（語法或編碼錯誤）則返回 None
+        """
+        if file_path in self._ast_cache:
+            return self._ast_cache[file_path]
+        
+        try:
+            tree = ast.parse(self._read_source(file_path), filename=file_path, type_comments=False)
+        except (SyntaxError, ValueError):
+            tree = None
+        
+        self._ast_cache[file_path] = tree
+        return tree
         
     def extract_models(self) -> List[Dict[str, Any]]:
         """
@@ -38,394 +156,198 @@ class SchemaExtractor:
             endpoint_analyzer = EndpointAnalyzer(self.project_path)
             self.framework = endpoint_analyzer.detect_framework()
         
-        # 根據框架選擇適當的提取方法
-        if self.framework == 'django':
-            self._extract_django_models()
-        elif self.framework == 'fastapi':
-            self._extract_fastapi_models()
-        elif self.framework == 'flask':
-            self._extract_flask_sqlalchemy_models()
-        
-        # 通用模型提取（作為後備）
-        if not self.models:
-            self._extract_generic_models()
+        try:
+            # 根據框架選擇適當的提取方法
+            if self.framework == 'django':
+                self._extract_django_models()
+            elif self.framework == 'fastapi':
+                self._extract_fastapi_models()
+            elif self.framework == 'flask':
+                self._extract_flask_sqlalchemy_models()
+            
+            # 通用模型提取（作為後備）
+            if not self.models:
+                self._extract_generic_models()
+        finally:
+            # 文件內容與語法樹只在單次提取中共用，提取結束即釋放
+            self._source_cache.clear()
+            self._ast_cache.clear()
             
         return self.models
     
     def _extract_django_models(self) -> None:
         """提取 Django 模型類別"""
         # 尋找 models.py 文件
-        model_files = []
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                if file == 'models.py':
-                    model_files.append(os.path.join(root, file))
-        
-        for model_file in model_files:
-            content = read_file(model_file)
-            
-            try:
-                tree = ast.parse(content)
-                
-                # 尋找繼承自 models.Model 的類別
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.ClassDef):
-                        # 檢查基類是否包含 models.Model
-                        inherits_model = False
-                        for base in node.bases:
-                            if isinstance(base, ast.Attribute) and isinstance(base.value, ast.Name):
-                                if base.value.id == 'models' and base.attr == 'Model':
-                                    inherits_model = True
-                        
-                        if inherits_model:
-                            # 提取模型欄位
-                            fields = []
-                            for item in node.body:
-                                if isinstance(item, ast.Assign):
-                                    for target in item.targets:
-                                        if isinstance(target, ast.Name):
-                                            field_name = target.id
-                                            field_type = None
-                                            field_args = []
-                                            
-                                            # 檢查欄位類型
-                                            if isinstance(item.value, ast.Call):
-                                                if isinstance(item.value.func, ast.Attribute) and \
-                                                   isinstance(item.value.func.value, ast.Name) and \
-                                                   item.value.func.value.id == 'models':
-                                                    field_type = item.value.func.attr
-                                                
-                                                # 提取字段參數
-                                                for keyword in item.value.keywords:
-                                                    if isinstance(keyword.value, ast.Constant):
-                                                        field_args.append({
-                                                            'name': keyword.arg,
-                                                            'value': keyword.value.value
-                                                        })
-                                            
-                                            if field_type:
-                                                fields.append({
-                                                    'name': field_name,
-                                                    'type': field_type,
-                                                    'args': field_args
-                                                })
-                            
-                            # 提取模型元資料
-                            meta_fields = {}
-                            for item in node.body:
-                                if isinstance(item, ast.ClassDef) and item.name == 'Meta':
-                                    for meta_item in item.body:
-                                        if isinstance(meta_item, ast.Assign):
-                                            for target in meta_item.targets:
-                                                if isinstance(target, ast.Name):
-                                                    meta_name = target.id
-                                                    
-                                                    # 處理不同類型的元數據值
-                                                    if isinstance(meta_item.value, ast.Constant):
-                                                        meta_fields[meta_name] = meta_item.value.value
-                                                    elif isinstance(meta_item.value, ast.List):
-                                                        meta_fields[meta_name] = [
-                                                            elt.value if isinstance(elt, ast.Constant) else None
-                                                            for elt in meta_item.value.elts
-                                                        ]
-                            
-                            # 添加模型到列表
-                            self.models.append({
-                                'name': node.name,
-                                'type': 'django.model',
-                                'fields': fields,
-                                'meta': meta_fields,
-                                'file': model_file,
-                                'line': node.lineno
-                            })
-            except SyntaxError:
-                continue
+        self._visit_files(
+            self._iter_model_files(lambda file_path: os.path.basename(file_path) == 'models.py'),
+            'django'
+        )
     
     def _extract_fastapi_models(self) -> None:
         """提取 FastAPI Pydantic 模型"""
-        # 搜尋 schemas.py 或任何 Python 文件
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    content = read_file(file_path)
-                    
-                    # 檢查是否導入 pydantic
-                    if 'pydantic' not in content.lower():
-                        continue
-                    
-                    try:
-                        tree = ast.parse(content)
-                        
-                        # 尋找繼承自 pydantic.BaseModel 的類別
-                        for node in ast.walk(tree):
-                            if isinstance(node, ast.ClassDef):
-                                # 檢查基類
-                                is_pydantic_model = False
-                                for base in node.bases:
-                                    if isinstance(base, ast.Attribute):
-                                        if isinstance(base.value, ast.Name) and base.value.id == 'pydantic' and base.attr == 'BaseModel':
-                                            is_pydantic_model = True
-                                    elif isinstance(base, ast.Name) and base.id == 'BaseModel':
-                                        # 也檢查直接導入的 BaseModel
-                                        is_pydantic_model = True
-                                
-                                if is_pydantic_model:
-                                    # 提取欄位
-                                    fields = []
-                                    for item in node.body:
-                                        if isinstance(item, ast.AnnAssign):
-                                            if isinstance(item.target, ast.Name):
-                                                field_name = item.target.id
-                                                
-                                                # 獲取類型註解
-                                                field_type = None
-                                                if isinstance(item.annotation, ast.Name):
-                                                    field_type = item.annotation.id
-                                                elif isinstance(item.annotation, ast.Subscript):
-                                                    if isinstance(item.annotation.value, ast.Name):
-                                                        field_type = f"{item.annotation.value.id}[...]"
-                                                
-                                                # 獲取默認值
-                                                default_value = None
-                                                if item.value:
-                                                    if isinstance(item.value, ast.Constant):
-                                                        default_value = item.value.value
-                                                    elif isinstance(item.value, ast.Call) and isinstance(item.value.func, ast.Name):
-                                                        default_value = f"{item.value.func.id}(...)"
-                                                
-                                                if field_name:
-                                                    fields.append({
-                                                        'name': field_name,
-                                                        'type': field_type,
-                                                        'default': default_value
-                                                    })
-                                    
-                                    # 添加模型到列表
-                                    self.models.append({
-                                        'name': node.name,
-                                        'type': 'pydantic.model',
-                                        'fields': fields,
-                                        'file': file_path,
-                                        'line': node.lineno
-                                    })
-                    except SyntaxError:
-                        continue
+        # 搜尋 schemas.py 或任何導入 pydantic 的 Python 文件
+        self._visit_files(self._iter_py_files(), 'pydantic')
     
     def _extract_flask_sqlalchemy_models(self) -> None:
         """提取 Flask SQLAlchemy 模型"""
-        # 搜尋潛在的模型文件
-        model_files = []
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    content = read_file(file_path)
-                    
-                    # 檢查是否包含 SQLAlchemy
-                    if 'sqlalchemy' not in content.lower() and 'db.Model' not in content:
-                        continue
-                    
-                    model_files.append(file_path)
+        # 搜尋包含 SQLAlchemy 的潛在模型文件
+        self._visit_files(self._iter_py_files(), 'sqlalchemy')
+    
+    def _extract_generic_models(self) -> None:
+        """通用模型提取方法（作為後備）"""
+        # 跳過已經處理過的文件，以及虛擬環境、遷移等不會定義專案模型的目錄
+        processed = {model['file'] for model in self.models}
+        self._visit_files(
+            self._iter_model_files(
+                lambda file_path: file_path not in processed and not self._in_skipped_dir(file_path)
+            ),
+            'generic'
+        )
+    
+    def _in_skipped_dir(self, file_path: str) -> bool:
+        """
+        檢查文件是否位於通用提取應略過的目錄中
         
-        for model_file in model_files:
-            content = read_file(model_file)
+        Args:
+            file_path: 文件路徑
             
+        Returns:
+            如果任一上層目錄屬於略過清單則返回 True
+        """
+        rel_dir = os.path.dirname(os.path.relpath(file_path, self.project_path))
+        return not _GENERIC_SKIP_DIRS.isdisjoint(rel_dir.split(os.sep))
+    
+    def _visit_files(self, file_paths: Iterable[str], kind: str) -> None:
+        """
+        對候選文件執行模型提取；文件數量多時分派到多個行程並行解析
+        
+        Args:
+            file_paths: 候選文件路徑（可為逐一產生的迭代器）
+            kind: 模型種類（'django'、'pydantic'、'sqlalchemy' 或 'generic'）
+        """
+        file_iter = iter(file_paths)
+        head = list(islice(file_iter, _PARALLEL_MIN_FILES))
+        
+        if len(head) >= _PARALLEL_MIN_FILES:
+            # 行程池會一次提交所有任務，因此這裡才需要完整的文件列表
+            file_paths = head + list(file_iter)
             try:
-                tree = ast.parse(content)
-                
-                # 尋找定義 db 變數的地方
-                db_var_name = 'db'
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.Assign):
-                        for target in node.targets:
-                            if isinstance(target, ast.Name) and isinstance(node.value, ast.Call):
-                                if isinstance(node.value.func, ast.Attribute) and node.value.func.attr == 'SQLAlchemy':
-                                    db_var_name = target.id
-                
-                # 尋找繼承自 db.Model 的類別
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.ClassDef):
-                        # 檢查基類是否包含 db.Model
-                        inherits_db_model = False
-                        for base in node.bases:
-                            if isinstance(base, ast.Attribute) and isinstance(base.value, ast.Name):
-                                if base.value.id == db_var_name and base.attr == 'Model':
-                                    inherits_db_model = True
-                        
-                        if inherits_db_model:
-                            # 提取模型欄位
-                            fields = []
-                            for item in node.body:
-                                if isinstance(item, ast.Assign):
-                                    for target in item.targets:
-                                        if isinstance(target, ast.Name):
-                                            field_name = target.id
-                                            field_type = None
-                                            field_args = []
-                                            
-                                            # 檢查欄位類型
-                                            if isinstance(item.value, ast.Call):
-                                                if isinstance(item.value.func, ast.Attribute) and \
-                                                   isinstance(item.value.func.value, ast.Name) and \
-                                                   (item.value.func.value.id == 'db' or 'Column' in item.value.func.attr):
-                                                    field_type = item.value.func.attr
-                                                    
-                                                    # 提取列參數
-                                                    for arg in item.value.args:
-                                                        if isinstance(arg, ast.Call) and isinstance(arg.func, ast.Attribute):
-                                                            field_args.append({
-                                                                'type': arg.func.attr
-                                                            })
-                                                    
-                                                    for keyword in item.value.keywords:
-                                                        field_args.append({
-                                                            'name': keyword.arg,
-                                                            'value': keyword.value
-                                                        })
-                                            
-                                            if field_type:
-                                                fields.append({
-                                                    'name': field_name,
-                                                    'type': field_type,
-                                                    'args': field_args
-                                                })
-                            
-                            # 添加模型到列表
-                            self.models.append({
-                                'name': node.name,
-                                'type': 'sqlalchemy.model',
-                                'fields': fields,
-                                'file': model_file,
-                                'line': node.lineno
-                            })
-            except SyntaxError:
-                continue
+                with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                    results = list(executor.map(
+                        parse_and_extract,
+                        [(file_path, kind) for file_path in file_paths],
+                        chunksize=16
+                    ))
+            except (OSError, BrokenProcessPool):
+                # 無法建立工作行程時退回單行程解析
+                results = None
+            
+            if results is not None:
+                for models in results:
+                    for model in models:
+                        self._add_model(model)
+                return
+        else:
+            file_paths = head
+        
+        for file_path in file_paths:
+            cache_path = get_cache_path(file_path, kind)
+            models = load_cached_models(cache_path)
+            if models is None:
+                models = self._extract_file_models(file_path, kind)
+                store_cached_models(cache_path, models)
+            
+            for model in models:
+                self._add_model(model)
     
-    def _extract_generic_models(self) -> None:
-        """通用模型提取方法（作為後備）"""
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    
-                    # 跳過已經處理過的文件
-                    if any(model['file'] == file_path for model in self.models):
-                        continue
-                    
-                    content = read_file(file_path)
-                    
-                    # 使用啟發式方法識別可能的模型
-                    # 例如，檢查包含常見資料庫相關屬性的類別
-                    model_indicators = ['id', 'created_at', 'updated_at', 'pk', 'primary_key']
-                    
-                    try:
-                        tree = ast.parse(content)
-                        
-                        for node in ast.walk(tree):
-                            if isinstance(node, ast.ClassDef):
-                                # 檢查類別是否有模型指標
-                                has_indicators = False
-                                fields = []
-                                
-                                for item in node.body:
-                                    # 檢查欄位分配
-                                    if isinstance(item, ast.Assign):
-                                        for target in item.targets:
-                                            if isinstance(target, ast.Name):
-                                                field_name = target.id
-                                                if field_name in model_indicators:
-                                                    has_indicators = True
-                                                
-                                                # 添加到欄位列表
-                                                fields.append({
-                                                    'name': field_name,
-                                                    'type': 'unknown'
-                                                })
-                                    
-                                    # 檢查類型註解分配
-                                    elif isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name):
-                                        field_name = item.target.id
-                                        if field_name in model_indicators:
-                                            has_indicators = True
-                                        
-                                        # 獲取類型註解
-                                        field_type = None
-                                        if isinstance(item.annotation, ast.Name):
-                                            field_type = item.annotation.id
-                                        
-                                        fields.append({
-                                            'name': field_name,
-                                            'type': field_type if field_type else 'unknown'
-                                        })
-                                
-                                # 如果有足夠的指標，將其添加為潛在模型
-                                if has_indicators and len(fields) >= 2:
-                                    self.models.append({
-                                        'name': node.name,
-                                        'type': 'potential.model',
-                                        'fields': fields,
-                                        'file': file_path,
-                                        'line': node.lineno,
-                                        'confidence': 'low'  # 表示這是一個啟發式檢測
-                                    })
-                    except SyntaxError:
-                        continue
+    def _extract_file_models(self, file_path: str, kind: str) -> List[Dict[str, Any]]:
+        """
+        從單一文件提取模型（使用實例上的內容與語法樹快取）
+        
+        Args:
+            file_path: 文件路徑
+            kind: 模型種類
+            
+        Returns:
+            該文件中的模型列表，文件無法讀取時返回空列表（與多行程解析相同）
+        """
+        models = []
+        try:
+            content = self._read_source(file_path)
+        except OSError:
+            return models
+        pattern = SOURCE_FILTERS.get(kind)
+        if pattern is not None and not pattern.search(content):
+            return models
+        
+        # 沒有類別定義的文件不可能包含模型，無需解析
+        if CLASS_MARKER not in content:
+            return models
+        
+        tree = self._get_tree(file_path)
+        if tree is not None:
+            db_var_name = find_db_var_name(tree) if kind == 'sqlalchemy' else 'db'
+            ModelVisitor(models.append, file_path, kind, db_var_name).visit(tree)
+        return models
     
     def extract_model_relationships(self) -> List[Dict[str, Any]]:
         """
         識別模型之間的關係
         
+        關係只識別一次並快取於實例上，每次返回快取內容的副本。
+        
         Returns:
             模型關係列表
         """
-        relationships = []
-        
         # 確保先提取模型
         if not self.models:
             self.extract_models()
         
-        # 尋找外鍵和關係
-        for model in self.models:
-            model_name = model['name']
-            model_type = model['type']
-            
-            if model_type == 'django.model':
-                # 檢查 Django ForeignKey, OneToOneField, ManyToManyField
-                for field in model['fields']:
-                    field_type = field.get('type', '')
-                    if field_type in ['ForeignKey', 'OneToOneField', 'ManyToManyField']:
-                        # 尋找關係的目標模型
-                        target_model = None
-                        for arg in field.get('args', []):
-                            if arg.get('name') == 'to':
-                                target_model = arg.get('value')
-                        
-                        if target_model:
-                            relationships.append({
-                                'source_model': model_name,
-                                'target_model': target_model,
-                                'field_name': field['name'],
-                                'relationship_type': field_type,
-                                'framework': 'django'
-                            })
-            
-            elif model_type == 'sqlalchemy.model':
-                # 檢查 SQLAlchemy 關係
-                for field in model['fields']:
-                    args = field.get('args', [])
-                    is_relationship = any('ForeignKey' in str(arg) for arg in args) or \
-                                     any('relationship' in str(arg) for arg in args)
+        if self._relationships is None:
+            self._relationships = self._find_relationships()
+        return [dict(relationship) for relationship in self._relationships]
+    
+    def _find_relationships(self) -> List[Dict[str, Any]]:
+        """
+        從已提取的模型中識別關係
+        
+        Returns:
+            模型關係列表
+        """
+        relationships = []
+        
+        # 檢查 Django ForeignKey, OneToOneField, ManyToManyField
+        for model in self._models_by_type.get('django.model', ()):
+            for field in model['fields']:
+                field_type = field.get('type', '')
+                if field_type in ('ForeignKey', 'OneToOneField', 'ManyToManyField'):
+                    # 尋找關係的目標模型
+                    target_model = None
+                    for arg in field.get('args', []):
+                        if arg.get('name') == 'to':
+                            target_model = arg.get('value')
                     
-                    if is_relationship:
-                        # 尋找關係的目標模型（這需要更深入的分析）
+                    if target_model:
                         relationships.append({
-                            'source_model': model_name,
+                            'source_model': model['name'],
+                            'target_model': target_model,
                             'field_name': field['name'],
-                            'relationship_type': 'SQLAlchemy Relationship',
-                            'framework': 'flask'
+                            'relationship_type': field_type,
+                            'framework': 'django'
                         })
         
+        # 檢查 SQLAlchemy 關係（關係欄位已在解析時標記）
+        for model in self._models_by_type.get('sqlalchemy.model', ()):
+            for field in model['fields']:
+                if field.get('_is_fk'):
+                    # 尋找關係的目標模型（這需要更深入的分析）
+                    relationships.append({
+                        'source_model': model['name'],
+                        'field_name': field['name'],
+                        'relationship_type': 'SQLAlchemy Relationship',
+                        'framework': 'flask'
+                    })
+        
         return relationships
     
     def get_schema_metrics(self) -> Dict[str, Any]:
@@ -441,20 +363,14 @@ class SchemaExtractor:
         # 計算總模型數
         total_models = len(self.models)
         
-        # 按類型分類模型
-        model_types = {}
-        for model in self.models:
-            model_type = model['type']
-            model_types[model_type] = model_types.get(model_type, 0) + 1
-        
-        # 計算平均欄位數
-        total_fields = sum(len(model.get('fields', [])) for model in self.models)
-        avg_fields_per_model = total_fields / total_models if total_models > 0 else 0
-        
-        # 識別複雜模型（有很多欄位的模型）
+        # 單次遍歷：按類型分類模型、累計欄位數並識別複雜模型（有很多欄位的模型）
+        type_counter = Counter()
+        total_fields = 0
         complex_models = []
         for model in self.models:
-            fields_count = len(model.get('fields', []))
+            type_counter[model['type']] += 1
+            fields_count = len(model.get('fields') or ())
+            total_fields += fields_count
             if fields_count > 10:  # 超過 10 個欄位的定義為複雜
                 complex_models.append({
                     'name': model['name'],
@@ -462,12 +378,15 @@ class SchemaExtractor:
                     'file': model.get('file', '')
                 })
         
+        # 計算平均欄位數
+        avg_fields_per_model = total_fields / total_models if total_models > 0 else 0
+        
         # 提取關係
         relationships = self.extract_model_relationships()
         
         return {
             'total_models': total_models,
-            'model_types': model_types,
+            'model_types': dict(type_counter),
             'avg_fields_per_model': avg_fields_per_model,
             'complex_models': complex_models,
             'relationships_count': len(relationships),
@@ -0,0 +1,508 @@
+"""
+模式提取器核心 - 語法樹走訪與單一文件的模型提取
+
+此模組只依賴標準庫且完整標註型別，與 SchemaExtractor 的流程控制分開，
+熱路徑可獨立最佳化（例如以 mypyc 編譯成原生擴充模組）而不影響其他程式碼。
+"""
+import ast
+import hashlib
+import os
+import pickle
+import re
+import sys
+import tempfile
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Pattern, Set, Tuple
+
+# 預先編譯的文件過濾模式，直接在原始位元組上比對，避免解碼與 lower() 複製
+_PYDANTIC_RE = re.compile(rb'pydantic', re.IGNORECASE)
+_SQLALCHEMY_RE = re.compile(rb'(?i:sqlalchemy)|db\.Model')
+
+# 各模型種類在解析前需通過的文件過濾條件
+SOURCE_FILTERS: Dict[str, Pattern[bytes]] = {
+    'pydantic': _PYDANTIC_RE,
+    'sqlalchemy': _SQLALCHEMY_RE,
+}
+
+# 設定此環境變數為目錄路徑時才啟用提取結果的磁碟快取（預設不寫入任何快取）
+_CACHE_DIR_ENV = 'SCHEMA_CACHE_DIR'
+
+# 快取格式版本：提取邏輯或模型字典的結構、值型別改變時必須遞增，使舊快取失效
+# （版本 2：SQLAlchemy 關鍵字參數值改為常數或原始碼文字，不再保存語法樹節點）
+_CACHE_VERSION = 2
+
+# 解析前的位元組預檢：不含類別定義的文件（設定、__init__、工具模組）直接略過
+CLASS_MARKER = b'class '
+
+# 各模型種類可識別的基類，以 (模組/變數名稱, 屬性名稱) 表示；直接導入的名稱以 None 為前綴
+_DJANGO_BASES = frozenset({('models', 'Model')})
+_PYDANTIC_BASES = frozenset({('pydantic', 'BaseModel'), (None, 'BaseModel')})
+
+
+# 依值節點類型分派的常數提取函數，以單次字典查詢取代 isinstance 判斷鏈
+_META_VALUE_HANDLERS: Dict[type, Callable[[Any], Any]] = {
+    ast.Constant: lambda value: value.value,
+    ast.List: lambda value: [elt.value if type(elt) is ast.Constant else None for elt in value.elts],
+}
+_DEFAULT_VALUE_HANDLERS: Dict[type, Callable[[Any], Any]] = {
+    ast.Constant: lambda value: value.value,
+    # 呼叫只保留函數名稱，例如 Field(...)
+    ast.Call: lambda value: sys.intern(f"{value.func.id}(...)") if type(value.func) is ast.Name else None,
+}
+
+
+def _base_keys(bases: List[ast.expr]) -> Set[Tuple[Optional[str], str]]:
+    """
+    將類別的基類轉換為可直接查表的鍵
+    
+    AST 節點類型不會被繼承，因此以 type() 身分比較取代 isinstance。
+    
+    Args:
+        bases: 類別定義的基類運算式列表
+        
+    Returns:
+        (模組/變數名稱, 屬性名稱) 的集合
+    """
+    keys = set()
+    for base in bases:
+        base_type = type(base)
+        if base_type is ast.Attribute:
+            value = base.value
+            if type(value) is ast.Name:
+                keys.add((value.id, base.attr))
+        elif base_type is ast.Name:
+            keys.add((None, base.id))
+    return keys
+
+
+class ModelVisitor(ast.NodeVisitor):
+    """
+    單次走訪語法樹並依框架收集模型類別
+    
+    模型只會定義在模組或類別層級，因此不進入函數主體。
+    """
+    
+    def __init__(self, add_model: Callable[[Dict[str, Any]], None], file_path: str, kind: str,
+                 db_var_name: str = 'db'):
+        """
+        初始化模型訪問者
+        
+        Args:
+            add_model: 收集到模型時呼叫的回調函數
+            file_path: 目前處理的文件路徑
+            kind: 模型種類（'django'、'pydantic'、'sqlalchemy' 或 'generic'）
+            db_var_name: SQLAlchemy 實例的變數名稱
+        """
+        self.add_model = add_model
+        self.file_path = file_path
+        self.db_var_name = db_var_name
+        self._collect = getattr(self, f'_collect_{kind}')
+        
+        # 通用提取沒有基類限制，其餘種類只處理繼承自已知基類的類別
+        model_bases: Dict[str, FrozenSet[Tuple[Optional[str], str]]] = {
+            'django': _DJANGO_BASES,
+            'pydantic': _PYDANTIC_BASES,
+            'sqlalchemy': frozenset({(db_var_name, 'Model')}),
+        }
+        self._model_bases = model_bases.get(kind)
+    
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        if self._model_bases is None or not self._model_bases.isdisjoint(_base_keys(node.bases)):
+            self._collect(node)
+        # 繼續檢查巢狀類別
+        self.generic_visit(node)
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        # 不進入函數主體
+        return
+    
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        # 不進入非同步函數主體
+        return
+    
+    def generic_visit(self, node: ast.AST) -> None:
+        # 類別只會出現在語句中，因此只遍歷語句而不進入運算式
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.stmt, ast.excepthandler)):
+                self.visit(child)
+    
+    def _collect_django(self, node: ast.ClassDef) -> None:
+        """收集繼承自 models.Model 的 Django 模型"""
+        # 單次遍歷類別主體，同時提取模型欄位與 Meta 元資料
+        fields = []
+        meta_fields = {}
+        for item in node.body:
+            item_type = type(item)
+            if item_type is ast.Assign:
+                self._extract_django_fields(item, fields)
+            elif item_type is ast.ClassDef and item.name == 'Meta':
+                self._extract_django_meta(item, meta_fields)
+        
+        # 添加模型到列表
+        self.add_model({
+            'name': node.name,
+            'type': 'django.model',
+            'fields': fields,
+            'meta': meta_fields,
+            'file': self.file_path,
+            'line': node.lineno
+        })
+    
+    @staticmethod
+    def _extract_django_fields(item: ast.Assign, fields: List[Dict[str, Any]]) -> None:
+        """從欄位賦值語句提取 Django 模型欄位"""
+        # 欄位呼叫只解析一次，多重賦值（a = b = models.X()）的各目標共用結果
+        if type(item.value) is not ast.Call:
+            return
+        field_type, field_args = _parse_django_field_call(item.value)
+        if not field_type:
+            return
+        
+        for target in item.targets:
+            if type(target) is ast.Name:
+                fields.append({
+                    'name': target.id,
+                    'type': field_type,
+                    'args': list(field_args)
+                })
+    
+    @staticmethod
+    def _extract_django_meta(meta_class: ast.ClassDef, meta_fields: Dict[str, Any]) -> None:
+        """從 Meta 內部類別提取模型元資料"""
+        for meta_item in meta_class.body:
+            if isinstance(meta_item, ast.Assign):
+                for target in meta_item.targets:
+                    if isinstance(target, ast.Name):
+                        # 處理不同類型的元數據值（不支援的類型不記錄）
+                        handler = _META_VALUE_HANDLERS.get(type(meta_item.value))
+                        if handler is not None:
+                            meta_fields[target.id] = handler(meta_item.value)
+    
+    def _collect_pydantic(self, node: ast.ClassDef) -> None:
+        """收集繼承自 pydantic.BaseModel 的模型"""
+        # 提取欄位
+        fields = []
+        for item in node.body:
+            if isinstance(item, ast.AnnAssign):
+                if isinstance(item.target, ast.Name):
+                    field_name = item.target.id
+                    
+                    # 獲取類型註解
+                    field_type = None
+                    if isinstance(item.annotation, ast.Name):
+                        field_type = item.annotation.id
+                    elif isinstance(item.annotation, ast.Subscript):
+                        if isinstance(item.annotation.value, ast.Name):
+                            # 格式化產生的字串在各欄位間重複出現，駐留後共用同一物件
+                            field_type = sys.intern(f"{item.annotation.value.id}[...]")
+                    
+                    # 獲取默認值
+                    default_value = None
+                    if item.value:
+                        handler = _DEFAULT_VALUE_HANDLERS.get(type(item.value))
+                        if handler is not None:
+                            default_value = handler(item.value)
+                    
+                    if field_name:
+                        fields.append({
+                            'name': field_name,
+                            'type': field_type,
+                            'default': default_value
+                        })
+        
+        # 添加模型到列表
+        self.add_model({
+            'name': node.name,
+            'type': 'pydantic.model',
+            'fields': fields,
+            'file': self.file_path,
+            'line': node.lineno
+        })
+    
+    def _collect_sqlalchemy(self, node: ast.ClassDef) -> None:
+        """收集繼承自 db.Model 的 SQLAlchemy 模型"""
+        # 提取模型欄位
+        fields = []
+        for item in node.body:
+            if isinstance(item, ast.Assign):
+                for target in item.targets:
+                    if isinstance(target, ast.Name):
+                        field_name = target.id
+                        field_type = None
+                        field_args = []
+                        
+                        # 檢查欄位類型
+                        if isinstance(item.value, ast.Call):
+                            if isinstance(item.value.func, ast.Attribute) and \
+                               isinstance(item.value.func.value, ast.Name) and \
+                               (item.value.func.value.id == 'db' or 'Column' in item.value.func.attr):
+                                field_type = item.value.func.attr
+                                
+                                # 提取列參數
+                                for arg in item.value.args:
+                                    if isinstance(arg, ast.Call) and isinstance(arg.func, ast.Attribute):
+                                        field_args.append({
+                                            'type': arg.func.attr
+                                        })
+                                
+                                # 參數值只保留常數或原始碼文字，模型中不保存語法樹節點
+                                for keyword in item.value.keywords:
+                                    value = keyword.value
+                                    field_args.append({
+                                        'name': keyword.arg,
+                                        'value': value.value if type(value) is ast.Constant else ast.unparse(value)
+                                    })
+                        
+                        if field_type:
+                            field = {
+                                'name': field_name,
+                                'type': field_type,
+                                'args': field_args
+                            }
+                            # 在解析時標記關係欄位，避免之後對參數逐一 str() 比對
+                            if self._is_relationship_field(field_args):
+                                field['_is_fk'] = True
+                            fields.append(field)
+        
+        # 添加模型到列表
+        self.add_model({
+            'name': node.name,
+            'type': 'sqlalchemy.model',
+            'fields': fields,
+            'file': self.file_path,
+            'line': node.lineno
+        })
+    
+    @staticmethod
+    def _is_relationship_field(field_args: List[Dict[str, Any]]) -> bool:
+        """檢查列參數（列類型或關鍵字名稱）是否標示外鍵或關係"""
+        for arg in field_args:
+            marker = arg.get('type') or arg.get('name') or ''
+            if 'ForeignKey' in marker or 'relationship' in marker:
+                return True
+        return False
+    
+    def _collect_generic(self, node: ast.ClassDef) -> None:
+        """以啟發式方法收集潛在模型"""
+        # 使用啟發式方法識別可能的模型
+        # 例如，檢查包含常見資料庫相關屬性的類別
+        model_indicators = ['id', 'created_at', 'updated_at', 'pk', 'primary_key']
+        
+        # 檢查類別是否有模型指標
+        has_indicators = False
+        fields = []
+        
+        for item in node.body:
+            item_type = type(item)
+            # 檢查欄位分配
+            if item_type is ast.Assign:
+                for target in item.targets:
+                    if isinstance(target, ast.Name):
+                        field_name = target.id
+                        if field_name in model_indicators:
+                            has_indicators = True
+                        
+                        # 添加到欄位列表
+                        fields.append({
+                            'name': field_name,
+                            'type': 'unknown'
+                        })
+            
+            # 檢查類型註解分配
+            elif item_type is ast.AnnAssign and type(item.target) is ast.Name:
+                field_name = item.target.id
+                if field_name in model_indicators:
+                    has_indicators = True
+                
+                # 獲取類型註解
+                field_type = None
+                if isinstance(item.annotation, ast.Name):
+                    field_type = item.annotation.id
+                
+                fields.append({
+                    'name': field_name,
+                    'type': field_type if field_type else 'unknown'
+                })
+        
+        # 如果有足夠的指標，將其添加為潛在模型
+        if has_indicators and len(fields) >= 2:
+            self.add_model({
+                'name': node.name,
+                'type': 'potential.model',
+                'fields': fields,
+                'file': self.file_path,
+                'line': node.lineno,
+                'confidence': 'low'  # 表示這是一個啟發式檢測
+            })
+
+
+def _parse_django_field_call(call: ast.Call) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+    """
+    解析 Django 欄位定義呼叫（例如 models.CharField(max_length=100)）
+    
+    Args:
+        call: 欄位賦值右側的呼叫節點
+        
+    Returns:
+        (欄位類型, 常數關鍵字參數列表)，不是 models.* 呼叫時欄位類型為 None
+    """
+    func = call.func
+    if not (type(func) is ast.Attribute and type(func.value) is ast.Name and func.value.id == 'models'):
+        return None, []
+    
+    # 提取字段參數
+    field_args = []
+    for keyword in call.keywords:
+        if type(keyword.value) is ast.Constant:
+            field_args.append({
+                'name': keyword.arg,
+                'value': keyword.value.value
+            })
+    return func.attr, field_args
+
+
+def find_db_var_name(tree: ast.Module) -> str:
+    """
+    尋找定義 db 變數（SQLAlchemy 實例）的名稱
+    
+    `db = SQLAlchemy(app)` 幾乎都寫在模組頂層，因此只檢查頂層語句，
+    不遍歷整棵語法樹。
+    
+    Args:
+        tree: 模組語法樹
+        
+    Returns:
+        db 變數名稱，找不到時返回 'db'
+    """
+    for node in tree.body:
+        if type(node) is ast.Assign and type(node.value) is ast.Call:
+            func = node.value.func
+            if type(func) is ast.Attribute and func.attr == 'SQLAlchemy':
+                for target in node.targets:
+                    if type(target) is ast.Name:
+                        return target.id
+    return 'db'
+
+
+def parse_and_extract(task: Tuple[str, str]) -> List[Dict[str, Any]]:
+    """
+    在工作行程中讀取、過濾並解析單一文件，直接返回提取出的模型
+    
+    只回傳模型列表而非整棵語法樹，以縮小行程間傳輸的資料量。
+    
+    Args:
+        task: (文件路徑, 模型種類)
+        
+    Returns:
+        該文件中的模型列表
+    """
+    file_path, kind = task
+    cache_path = get_cache_path(file_path, kind)
+    models = load_cached_models(cache_path)
+    if models is not None:
+        return models
+    
+    models = []
+    try:
+        with open(file_path, 'rb') as file:
+            content = file.read()
+    except OSError:
+        return models
+    
+    pattern = SOURCE_FILTERS.get(kind)
+    if pattern is not None and not pattern.search(content):
+        store_cached_models(cache_path, models)
+        return models
+    
+    if CLASS_MARKER in content:
+        try:
+            tree = ast.parse(content, filename=file_path, type_comments=False)
+        except (SyntaxError, ValueError):
+            tree = None
+        
+        if tree is not None:
+            db_var_name = find_db_var_name(tree) if kind == 'sqlalchemy' else 'db'
+            ModelVisitor(models.append, file_path, kind, db_var_name).visit(tree)
+    
+    store_cached_models(cache_path, models)
+    return models
+
+
+def get_cache_path(file_path: str, kind: str) -> Optional[str]:
+    """
+    取得文件提取結果的磁碟快取路徑
+    
+    快取預設停用，設定環境變數 SCHEMA_CACHE_DIR 為快取目錄時才啟用；
+    單行程與多行程解析都經由此函數查詢快取。快取鍵包含文件路徑、
+    修改時間與大小，文件變更後自然失效。
+    
+    Args:
+        file_path: 文件路徑
+        kind: 模型種類
+        
+    Returns:
+        快取文件路徑，未啟用快取或無法取得文件狀態時返回 None
+    """
+    cache_dir = os.environ.get(_CACHE_DIR_ENV)
+    if not cache_dir:
+        return None
+    
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    
+    key = repr((
+        _CACHE_VERSION, kind, file_path, os.path.abspath(file_path),
+        stat.st_mtime_ns, stat.st_size
+    ))
+    digest = hashlib.blake2b(key.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+    return os.path.join(cache_dir, f'{digest}.pkl')
+
+
+def load_cached_models(cache_path: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+    """
+    從磁碟快取載入文件的模型列表
+    
+    Args:
+        cache_path: 快取文件路徑
+        
+    Returns:
+        快取的模型列表，未命中或快取損壞時返回 None
+    """
+    if cache_path is None:
+        return None
+    
+    try:
+        with open(cache_path, 'rb') as file:
+            models = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError, ValueError):
+        return None
+    
+    return models if isinstance(models, list) else None
+
+
+def store_cached_models(cache_path: Optional[str], models: List[Dict[str, Any]]) -> None:
+    """
+    將文件的模型列表寫入磁碟快取（先寫入暫存檔再原子替換）
+    
+    Args:
+        cache_path: 快取文件路徑
+        models: 模型列表
+    """
+    if cache_path is None:
+        return
+    
+    try:
+        cache_dir = os.path.dirname(cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                pickle.dump(models, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except (OSError, pickle.PicklingError, RecursionError):
+        # 快取只是加速手段，寫入失敗不影響提取結果
+        pass
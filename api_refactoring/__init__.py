@@ -3,11 +3,32 @@ API 重構工具套件 - 提供適用於 Web API 的特定重構工具
 支援 API 版本化、安全性增強、性能優化等功能。
 """
 
+import importlib
 from typing import Dict, List, Optional, Any
 
-# 導出主要類
-from .api_versioning import APIVersioningHelper
-from .auth_refactoring import AuthRefactoringHelper
-from .performance_optimizer import APIPerformanceOptimizer
-from .security_enhancer import APISecurityEnhancer
-from .restful_design import RESTfulDesignAnalyzer
\ No newline at end of file
+# 導出主要類（首次存取時才導入對應子模組，見 PEP 562）
+_LAZY_EXPORTS = {
+    'APIVersioningHelper': 'api_versioning',
+    'AuthRefactoringHelper': 'auth_refactoring',
+    'APIPerformanceOptimizer': 'performance_optimizer',
+    'APISecurityEnhancer': 'security_enhancer',
+    'RESTfulDesignAnalyzer': 'restful_design',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(f'.{module_name}', __name__)
+    value = getattr(module, name)
+    # 快取到模組命名空間，之後的存取不再經過 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
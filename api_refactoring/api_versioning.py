@@ -1,14 +1,537 @@
 """
 API 版本控制助手 - 提供 API 版本控制和遷移工具
 """
-import ast
+import copy
+import hashlib
 import os
+import pickle
 import re
-from typing import Dict, List, Tuple, Optional, Any
+import sys
+import tempfile
+import threading
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Set, Tuple, Optional, Any
 
-from utils.file_operations import read_file, write_file
 from api_analyzer.endpoint_analyzer import EndpointAnalyzer
-from code_analyzer.ast_parser import analyze_python_file
+from utils.file_operations import SKIP_DIRS
+from .plan_models import ClientChange, RollbackStep, UpgradePhase, fill_template
+
+# URL 路徑中的版本模式，合併為單一正則：優先匹配 /v1/ 形式（例如 /v1/users、/api/v1/users），
+# 其次才是 /api/1.0/ 形式；以錨定的前瞻分支保持這個優先順序，而非最左匹配
+_URL_VERSION_RE = re.compile(
+    r'^(?:(?=.*?/v(?P<simple>\d+)/)|(?=.*?/api/(?P<decimal>\d+\.\d+)/))',
+    re.DOTALL
+)
+# 範例中顯示的各分支原始模式
+_URL_VERSION_PATTERN_TEXT = {
+    'simple': r'/v(\d+)/',
+    'decimal': r'/api/(\d+\.\d+)/'
+}
+
+# 與版本相關的標頭和參數名稱（合併為單一模式，較長的名稱優先匹配）
+# 文件以原始位元組掃描，因此相關名稱與模式皆為位元組
+_VERSION_HEADERS = frozenset({b'api-version', b'x-api-version', b'accept-version', b'version'})
+_HEADER_OR_PARAM_RE = re.compile(
+    rb'[\'\"]?(?P<name>api-version|x-api-version|accept-version|api_version|version|v)[\'\"]?',
+    re.IGNORECASE
+)
+# 上述名稱都包含字母 v，不含這些子字串的文件不可能匹配
+_VERSION_CODE_GATES = (b'v', b'V')
+
+# 程式碼中以引號包圍的版本號，例如 'v1'、"2.0"
+_QUOTED_VERSION_RE = re.compile(rb'[\'\"]v?(\d+(?:\.\d+)?)[\'\"]')
+
+# 版本化的目錄名和文件名
+_VERSION_DIR_RE = re.compile(r'v(\d+(\.\d+)?)')
+_VERSION_FILE_RE = re.compile(r'_v(\d+(\.\d+)?)')
+
+# 文件內容快取上限：單一文件與總量（位元組）
+_MAX_CACHED_FILE_SIZE = 4 * 1024 * 1024
+_MAX_CACHED_TOTAL_SIZE = 128 * 1024 * 1024
+
+# 待掃描文件數達到此門檻時才使用執行緒池並行掃描
+_PARALLEL_MIN_FILES = 64
+
+# 版本控制分析結果的磁碟快取；結果的結構或型別改變時需遞增版本號，使舊快取失效
+# （版本 2：detected_versions 由 frozenset 改回 set）
+_STATUS_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'api_reconstructor', 'versioning')
+_STATUS_CACHE_VERSION = 2
+
+
+# 各框架與版本控制方案的代碼示例
+_DJANGO_URL_PATH_EXAMPLE = '''
+# settings.py
+REST_FRAMEWORK = {
+    'DEFAULT_VERSIONING_CLASS': 'rest_framework.versioning.URLPathVersioning',
+    'DEFAULT_VERSION': 'v1',
+    'ALLOWED_VERSIONS': ['v1', 'v2'],
+    'VERSION_PARAM': 'version',
+}
+
+# urls.py
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from . import views
+
+router = DefaultRouter()
+router.register(r'users', views.UserViewSet)
+
+urlpatterns = [
+    path('api/<str:version>/', include(router.urls)),
+]
+
+# views.py
+from rest_framework import viewsets
+from rest_framework.response import Response
+
+class UserViewSet(viewsets.ModelViewSet):
+    def list(self, request, *args, **kwargs):
+        if request.version == 'v1':
+            # v1 implementation
+            return Response({"message": "This is API v1"})
+        elif request.version == 'v2':
+            # v2 implementation
+            return Response({"message": "This is API v2"})
+'''
+
+_FLASK_URL_PATH_EXAMPLE = '''
+# Using Flask Blueprints for versioning
+from flask import Flask, Blueprint, jsonify
+
+app = Flask(__name__)
+
+# Create blueprints for different versions
+v1_blueprint = Blueprint('v1', __name__, url_prefix='/api/v1')
+v2_blueprint = Blueprint('v2', __name__, url_prefix='/api/v2')
+
+@v1_blueprint.route('/users')
+def get_users_v1():
+    # v1 implementation
+    return jsonify({"message": "This is API v1"})
+@v2_blueprint.route('/users')
+def get_users_v2():
+    # v2 implementation
+    return jsonify({"message": "This is API v2", "data": {"enhanced": True}})
+
+# Register blueprints
+app.register_blueprint(v1_blueprint)
+app.register_blueprint(v2_blueprint)
+
+# Alternative approach with version as URL parameter
+@app.route('/api/users')
+def get_users():
+    version = request.args.get('version', '1')
+    if version == '1':
+        # v1 implementation
+        return jsonify({"message": "This is API v1"})
+    elif version == '2':
+        # v2 implementation
+        return jsonify({"message": "This is API v2", "data": {"enhanced": True}})
+    else:
+        return jsonify({"error": "Unsupported API version"}), 400
+'''
+
+_FASTAPI_URL_PATH_EXAMPLE = '''
+from fastapi import FastAPI, APIRouter, Depends, Header
+
+app = FastAPI()
+
+# Create routers for different versions
+v1_router = APIRouter(prefix="/api/v1", tags=["v1"])
+v2_router = APIRouter(prefix="/api/v2", tags=["v2"])
+
+# Version 1 endpoints
+@v1_router.get("/users")
+async def get_users_v1():
+    # v1 implementation
+    return {"message": "This is API v1"}
+
+# Version 2 endpoints with enhanced features
+@v2_router.get("/users")
+async def get_users_v2():
+    # v2 implementation
+    return {"message": "This is API v2", "data": {"enhanced": True}}
+
+# Include routers
+app.include_router(v1_router)
+app.include_router(v2_router)
+
+# Alternative approach with header versioning
+@app.get("/api/users")
+async def get_users(api_version: str = Header("1.0")):
+    if api_version.startswith("1"):
+        # v1 implementation
+        return {"message": "This is API v1"}
+    elif api_version.startswith("2"):
+        # v2 implementation
+        return {"message": "This is API v2", "data": {"enhanced": True}}
+    else:
+        return {"error": "Unsupported API version"}
+'''
+
+_DJANGO_HEADER_EXAMPLE = '''
+# settings.py
+REST_FRAMEWORK = {
+    'DEFAULT_VERSIONING_CLASS': 'rest_framework.versioning.AcceptHeaderVersioning',
+    'DEFAULT_VERSION': '1.0',
+    'ALLOWED_VERSIONS': ['1.0', '2.0'],
+    'VERSION_PARAM': 'version',
+}
+
+# views.py
+from rest_framework import viewsets
+from rest_framework.response import Response
+
+class UserViewSet(viewsets.ModelViewSet):
+    def list(self, request, *args, **kwargs):
+        if request.version == '1.0':
+            # v1.0 implementation
+            return Response({"message": "This is API v1.0"})
+        elif request.version == '2.0':
+            # v2.0 implementation
+            return Response({"message": "This is API v2.0"})
+'''
+
+_DJANGO_STRUCTURE_EXAMPLE = '''
+# api/v1/views.py
+from rest_framework import viewsets
+from rest_framework.response import Response
+
+class UserViewSet(viewsets.ModelViewSet):
+    def list(self, request):
+        return Response({"message": "This is API v1"})
+
+# api/v2/views.py
+from rest_framework import viewsets
+from rest_framework.response import Response
+
+class UserViewSet(viewsets.ModelViewSet):
+    def list(self, request):
+        return Response({"message": "This is API v2", "data": {"enhanced": True}})
+
+# urls.py
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from api.v1 import views as v1_views
+from api.v2 import views as v2_views
+
+v1_router = DefaultRouter()
+v1_router.register(r'users', v1_views.UserViewSet)
+
+v2_router = DefaultRouter()
+v2_router.register(r'users', v2_views.UserViewSet)
+
+urlpatterns = [
+    path('api/v1/', include(v1_router.urls)),
+    path('api/v2/', include(v2_router.urls)),
+]
+'''
+
+_FLASK_HEADER_EXAMPLE = '''
+from flask import Flask, jsonify, request
+
+app = Flask(__name__)
+
+@app.route('/api/users')
+def get_users():
+    # Check API version from header
+    api_version = request.headers.get('X-API-Version', '1.0')
+    
+    if api_version == '1.0':
+        # v1.0 implementation
+        return jsonify({"message": "This is API v1.0"})
+    elif api_version == '2.0':
+        # v2.0 implementation
+        return jsonify({"message": "This is API v2.0", "data": {"enhanced": True}})
+    else:
+        return jsonify({"error": "Unsupported API version"}), 400
+'''
+
+_FLASK_STRUCTURE_EXAMPLE = '''
+# api/v1/users.py
+from flask import Blueprint, jsonify
+
+v1_users = Blueprint('v1_users', __name__)
+
+@v1_users.route('/users')
+def get_users():
+    return jsonify({"message": "This is API v1"})
+
+# api/v2/users.py
+from flask import Blueprint, jsonify
+
+v2_users = Blueprint('v2_users', __name__)
+
+@v2_users.route('/users')
+def get_users():
+    return jsonify({"message": "This is API v2", "data": {"enhanced": True}})
+
+# app.py
+from flask import Flask
+from api.v1.users import v1_users
+from api.v2.users import v2_users
+
+app = Flask(__name__)
+app.register_blueprint(v1_users, url_prefix='/api/v1')
+app.register_blueprint(v2_users, url_prefix='/api/v2')
+'''
+
+_FASTAPI_HEADER_EXAMPLE = '''
+from fastapi import FastAPI, Header
+
+app = FastAPI()
+
+@app.get("/api/users")
+async def get_users(x_api_version: str = Header("1.0", alias="X-API-Version")):
+    if x_api_version == "1.0":
+        # v1.0 implementation
+        return {"message": "This is API v1.0"}
+    elif x_api_version == "2.0":
+        # v2.0 implementation
+        return {"message": "This is API v2.0", "data": {"enhanced": True}}
+    else:
+        return {"error": "Unsupported API version"}
+'''
+
+_FASTAPI_STRUCTURE_EXAMPLE = '''
+# app/api/v1/users.py
+from fastapi import APIRouter
+
+router = APIRouter()
+
+@router.get("/users")
+async def get_users():
+    return {"message": "This is API v1"}
+
+# app/api/v2/users.py
+from fastapi import APIRouter
+
+router = APIRouter()
+
+@router.get("/users")
+async def get_users():
+    return {"message": "This is API v2", "data": {"enhanced": True}}
+
+# main.py
+from fastapi import FastAPI
+from app.api.v1 import users as users_v1
+from app.api.v2 import users as users_v2
+
+app = FastAPI()
+
+app.include_router(users_v1.router, prefix="/api/v1")
+app.include_router(users_v2.router, prefix="/api/v2")
+'''
+
+_GENERIC_CODE_EXAMPLE = '''
+// URL path versioning example
+GET /api/v1/users
+GET /api/v2/users
+
+// HTTP header versioning example
+GET /api/users
+Header: X-API-Version: 1.0
+
+// Query parameter versioning
+GET /api/users?version=1.0
+'''
+
+_CODE_EXAMPLES = {
+    'django': {
+        'url_path': _DJANGO_URL_PATH_EXAMPLE,
+        'http_header': _DJANGO_HEADER_EXAMPLE,
+        'structure': _DJANGO_STRUCTURE_EXAMPLE
+    },
+    'flask': {
+        'url_path': _FLASK_URL_PATH_EXAMPLE,
+        'http_header': _FLASK_HEADER_EXAMPLE,
+        'structure': _FLASK_STRUCTURE_EXAMPLE
+    },
+    'fastapi': {
+        'url_path': _FASTAPI_URL_PATH_EXAMPLE,
+        'http_header': _FASTAPI_HEADER_EXAMPLE,
+        'structure': _FASTAPI_STRUCTURE_EXAMPLE
+    }
+}
+
+
+# 版本遷移步驟中各步驟的任務清單
+_STANDARDIZE_TASKS = (
+    '確保所有端點都一致地使用版本控制',
+    '採用統一的版本格式（推薦 MAJOR.MINOR）',
+    '為所有支援的版本提供適當的文檔',
+    '為不再維護的版本制定棄用策略'
+)
+_INITIAL_VERSIONING_TASKS = (
+    '選擇初始版本號（推薦從 v1 或 1.0 開始）',
+    '更新路由/端點定義以包含版本信息',
+    '更新文檔以反映版本化 API',
+    '在所有 API 客戶端通訊中提及版本控制'
+)
+_SCHEME_SWITCH_TASKS = (
+    '創建新的版本化端點或處理邏輯',
+    '保持現有端點正常運作以向後兼容',
+    '設置重定向或橋接處理程式',
+    '更新文檔以解釋兩種方案'
+)
+_SCHEME_DEPRECATION_TASKS = (
+    '宣布棄用時間表（建議至少 6 個月）',
+    '在舊端點回應中添加棄用通知',
+    '監測舊端點使用情況',
+    '在棄用期結束時實施日落策略'
+)
+_BEST_PRACTICE_TASKS = (
+    '建立清晰的版本控制策略和向後兼容性指導方針',
+    '使用語義版本控制原則 (SemVer) 管理版本號',
+    '為所有 API 更改維護詳細的變更日誌',
+    '實施自動化測試以驗證各版本的端點行為',
+    '為關鍵 API 客戶端提供遷移指南和支援'
+)
+
+# 版本升級階段模板，{cv} 和 {tv} 分別代表當前版本與目標版本
+_UPGRADE_PHASE_TEMPLATES = (
+    UpgradePhase('規劃與準備', '定義範圍並準備升級工作', (
+        '完整記錄所有計劃更改，尤其是破壞性更改',
+        '為現有端點和預期端點建立完整的測試套件',
+        '建立詳細的回滾計劃',
+        '與 API 消費者溝通升級時間表',
+        '準備版本化的路由結構'
+    )),
+    UpgradePhase('實現 {tv} 端點', '同時維護舊版和新版 API', (
+        '創建新的 {tv} 端點結構',
+        '實現所有端點的新版本',
+        '為新功能添加新端點',
+        '為破壞性更改重新設計受影響的端點',
+        '更新文檔以反映新端點'
+    )),
+    UpgradePhase('測試與驗證', '確保新版 API 滿足所有需求', (
+        '對所有新端點執行單元和整合測試',
+        '進行性能測試以確保與或優於當前版本',
+        '進行安全測試',
+        '邀請合作夥伴進行 beta 測試',
+        '驗證向後兼容性（如果承諾）'
+    )),
+    UpgradePhase('部署與發布', '向用戶發布新版本', (
+        '部署 {tv} API 端點到生產環境',
+        '設置監控和警報',
+        '發布版本公告和文檔',
+        '持續監測使用情況和性能',
+        '準備支援團隊處理可能的問題'
+    )),
+    UpgradePhase('客戶端遷移', '協助客戶端遷移到新版本', (
+        '提供詳細的遷移指南',
+        '提供遷移工具（如果適用）',
+        '提供支援渠道',
+        '監測舊版 API 的使用情況',
+        '與關鍵客戶合作進行遷移'
+    ))
+)
+
+# 有破壞性更改時追加的棄用階段模板
+_DEPRECATION_PHASE_TEMPLATE = UpgradePhase('棄用 {cv}', '逐步淘汰舊版 API', (
+    '設定 {cv} 的棄用時間表（通常為 6-12 個月）',
+    '在舊版 API 回應中添加棄用警告',
+    '隨著時間的推移降低舊版 API 的服務等級',
+    '定期向仍使用舊版 API 的客戶端發送提醒',
+    '在棄用日期後停用 {cv} 端點'
+))
+
+# 客戶端遷移指南模板
+_CLIENT_MIGRATION_STEPS = (
+    '更新 API 客戶端中的版本引用（從 {cv} 到 {tv}）',
+    '測試所有 API 調用以確保兼容性',
+    '利用新特性和改進',
+    '移除任何不再支援的功能的使用'
+)
+
+# 破壞性更改未提供遷移操作時使用的預設說明
+_DEFAULT_MIGRATION_ACTION = '修改您的客戶端代碼以適應此更改'
+
+# 未提供破壞性更改時的假設更改示例
+_DEFAULT_CLIENT_CHANGES = (
+    ClientChange('endpoint_path', '某些端點路徑可能已更改', '更新您的 API 調用中的所有端點 URL'),
+    ClientChange('request_format', '請求和回應格式可能已更改', '確保您的 API 調用使用正確的請求格式，並能正確處理新的回應格式'),
+    ClientChange('new_features', '{tv} 中添加了新功能', '查看文檔了解如何利用新功能')
+)
+
+# 回滾計劃模板
+_ROLLBACK_TRIGGERS = (
+    '關鍵功能無法正常運作',
+    '關鍵性能下降或可用性問題',
+    '安全漏洞',
+    '大量客戶端報告問題'
+)
+
+_ROLLBACK_STEPS = (
+    RollbackStep('決策', '評估問題嚴重程度並做出回滾決定', 'API 產品負責人和技術負責人'),
+    RollbackStep('通知', '通知相關團隊和重要客戶即將進行回滾', '產品和支援團隊'),
+    RollbackStep('執行回滾', '將流量從 {tv} 重定向回 {cv}', '運維團隊'),
+    RollbackStep('驗證', '確認所有端點都已回滾且運作正常', 'QA 團隊'),
+    RollbackStep('後續跟進', '分析回滾原因並制定修復計劃', '開發團隊')
+)
+
+_ROLLBACK_VERIFICATION_CHECKS = (
+    '端點可達性測試',
+    '基本功能測試',
+    '性能測試',
+    '客戶端連接性測試'
+)
+
+
+@lru_cache(maxsize=256)
+def _build_rollback_plan(current_version: str, target_version: str) -> Mapping[str, Any]:
+    """
+    生成回滾計劃，同一組版本只建立一次
+    
+    結果為唯讀結構（MappingProxyType 和 tuple），可安全地在多次呼叫間共用；
+    放入計劃前由 _generate_rollback_plan 複製為普通字典與列表。
+    
+    Args:
+        current_version: 當前版本
+        target_version: 目標版本
+        
+    Returns:
+        唯讀的回滾計劃
+    """
+    return MappingProxyType({
+        'title': f'從 {target_version} 回滾到 {current_version} 的計劃',
+        'triggers': _ROLLBACK_TRIGGERS,
+        'steps': tuple(
+            MappingProxyType(step.as_dict(current_version, target_version)) for step in _ROLLBACK_STEPS
+        ),
+        'verification_checks': _ROLLBACK_VERIFICATION_CHECKS
+    })
+
+
+@lru_cache(maxsize=256)
+def _build_code_samples(current_version: str, target_version: str) -> Mapping[str, str]:
+    """
+    生成客戶端遷移指南的示例代碼，同一組版本只建立一次
+    
+    Args:
+        current_version: 當前版本
+        target_version: 目標版本
+        
+    Returns:
+        唯讀的遷移前後示例代碼
+    """
+    return MappingProxyType({
+        'before': f'// API {current_version} 調用示例\nawait fetch("/api/{current_version}/users");',
+        'after': f'// API {target_version} 調用示例\nawait fetch("/api/{target_version}/users");'
+    })
+
+
+@dataclass(slots=True)
+class _DetectorResult:
+    """單一版本控制檢測器的結果"""
+    has_versioning: bool = False
+    versions: Set[str] = field(default_factory=set)
+    distribution: Counter = field(default_factory=Counter)
+    examples: List[Dict[str, Any]] = field(default_factory=list)
 
 
 class APIVersioningHelper:
@@ -25,19 +548,161 @@ class APIVersioningHelper:
         self.project_path = project_path
         self.framework = framework
         self.endpoints = None
+        self._walk_root: Optional[str] = None
+        self._py_files: Optional[List[str]] = None
+        self._dirs_by_parent: Dict[str, List[str]] = {}
+        self._py_files_by_dir: Dict[str, List[str]] = {}
+        self._file_contents: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._cached_size = 0
+        self._cache_lock = threading.Lock()
+        self._status_cache: Optional[Dict[str, Any]] = None
         
         # 如果未指定框架，則檢測框架
         if not self.framework:
             endpoint_analyzer = EndpointAnalyzer(self.project_path)
             self.framework = endpoint_analyzer.detect_framework()
     
+    def invalidate(self) -> None:
+        """清除已快取的版本控制狀態、目錄遍歷結果和文件內容"""
+        self._status_cache = None
+        self._py_files = None
+        self._dirs_by_parent = {}
+        self._py_files_by_dir = {}
+        self._file_contents.clear()
+        self._cached_size = 0
+    
+    def _scan_project(self) -> None:
+        """
+        以 os.scandir 單次遍歷專案，建立各檢測器共用的目錄索引
+        
+        遍歷結果快取於實例上：
+        - _py_files: 所有 Python 文件路徑
+        - _dirs_by_parent: 每個目錄的子目錄名列表（按遍歷順序）
+        - _py_files_by_dir: 每個目錄中的 Python 文件名列表
+        """
+        # 專案路徑變更時，先前的遍歷與文件內容都已失效
+        if self._walk_root != self.project_path:
+            self.invalidate()
+            self._walk_root = self.project_path
+        
+        if self._py_files is not None:
+            return
+        
+        py_files = []
+        stack = [self.project_path]
+        while stack:
+            root = stack.pop()
+            try:
+                with os.scandir(root) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            
+            dirs = []
+            links = set()
+            py_names = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                
+                if is_dir:
+                    # 略過不需要遍歷的目錄
+                    if entry.name in SKIP_DIRS or entry.name.startswith('.'):
+                        continue
+                    dirs.append(entry.name)
+                    if entry.is_symlink():
+                        links.add(entry.name)
+                elif entry.name.endswith('.py'):
+                    py_names.append(entry.name)
+            
+            # 排序以確保遍歷順序穩定
+            dirs.sort()
+            py_names.sort()
+            self._dirs_by_parent[root] = dirs
+            self._py_files_by_dir[root] = py_names
+            py_files.extend(os.path.join(root, file) for file in py_names)
+            
+            # 與 os.walk 相同，不進入符號連結的目錄；反向壓入堆疊以保持先序遍歷順序
+            stack.extend(os.path.join(root, d) for d in reversed(dirs) if d not in links)
+        self._py_files = py_files
+    
+    def _iter_py_files(self) -> List[str]:
+        """
+        獲取專案中的所有 Python 文件路徑
+        
+        Returns:
+            Python 文件路徑列表
+        """
+        self._scan_project()
+        return self._py_files
+    
+    def _read_bytes_cached(self, file_path: str) -> bytes:
+        """
+        讀取文件的原始位元組，並以 LRU 方式在大小上限內快取
+        
+        內容不經解碼，版本掃描只需要比對 ASCII 標記。
+        
+        Args:
+            file_path: 文件路徑
+            
+        Returns:
+            文件內容（位元組）
+        """
+        # 快取可能被多個掃描執行緒同時存取
+        with self._cache_lock:
+            content = self._file_contents.get(file_path)
+            if content is not None:
+                self._file_contents.move_to_end(file_path)
+                return content
+        
+        with open(file_path, 'rb') as file:
+            content = file.read()
+        size = len(content)
+        if size <= _MAX_CACHED_FILE_SIZE:
+            with self._cache_lock:
+                if file_path not in self._file_contents:
+                    self._file_contents[file_path] = content
+                    self._cached_size += size
+                # 超過總量上限時淘汰最久未使用的文件
+                while self._cached_size > _MAX_CACHED_TOTAL_SIZE:
+                    _, evicted = self._file_contents.popitem(last=False)
+                    self._cached_size -= len(evicted)
+        
+        return content
+    
     def analyze_versioning_status(self) -> Dict[str, Any]:
         """
         分析專案目前的版本控制狀態
         
+        結果快取於實例上，專案變更後可呼叫 invalidate() 重新分析。
+        每次返回快取結果的副本，呼叫端修改返回值不會影響之後的呼叫。
+        
         Returns:
             版本控制狀態資訊的字典
         """
+        # 深層複製，問題與範例等巢狀字典也不與快取共用
+        return copy.deepcopy(self._get_status())
+    
+    def _get_status(self) -> Dict[str, Any]:
+        """
+        取得快取的版本控制狀態，未快取時進行分析（供內部唯讀使用）
+        
+        Returns:
+            版本控制狀態資訊的字典（快取中的同一物件，不可修改）
+        """
+        if self._status_cache is not None and self._walk_root == self.project_path:
+            return self._status_cache
+        
+        # 專案內容未變更時直接使用磁碟快取的結果
+        cache_path = self._status_cache_path()
+        fingerprint = self._fingerprint() if cache_path else None
+        cached_status = self._load_cached_status(cache_path, fingerprint)
+        if cached_status is not None:
+            self._status_cache = cached_status
+            return cached_status
+        
         # 使用 EndpointAnalyzer 獲取端點
         endpoint_analyzer = EndpointAnalyzer(self.project_path)
         self.endpoints = endpoint_analyzer.analyze_endpoints()
@@ -47,33 +712,33 @@ class APIVersioningHelper:
             'has_versioning': False,
             'versioning_scheme': 'none',
             'detected_versions': set(),
-            'version_distribution': {},
+            'version_distribution': Counter(),
             'versioning_issues': [],
             'examples': []
         }
         
         # 檢查 URL 路徑中的版本模式
         url_versions = self._detect_url_path_versioning()
-        if url_versions['has_versioning']:
+        if url_versions.has_versioning:
             versioning_info['has_versioning'] = True
             versioning_info['versioning_scheme'] = 'url_path'
-            versioning_info['detected_versions'] = url_versions['versions']
-            versioning_info['version_distribution'] = url_versions['distribution']
-            versioning_info['examples'] = url_versions['examples']
+            versioning_info['detected_versions'] = url_versions.versions
+            versioning_info['version_distribution'] = url_versions.distribution
+            versioning_info['examples'] = url_versions.examples
         
         # 如果未在 URL 路徑中檢測到版本，則檢查標頭或參數版本控制
         if not versioning_info['has_versioning']:
             header_versions = self._detect_header_versioning()
-            if header_versions['has_versioning']:
+            if header_versions.has_versioning:
                 versioning_info['has_versioning'] = True
                 versioning_info['versioning_scheme'] = 'http_header'
-                versioning_info['detected_versions'] = header_versions['versions']
-                versioning_info['version_distribution'] = header_versions['distribution']
-                versioning_info['examples'] = header_versions['examples']
+                versioning_info['detected_versions'] = header_versions.versions
+                versioning_info['version_distribution'] = header_versions.distribution
+                versioning_info['examples'] = header_versions.examples
         
         # 檢查檔案/目錄結構中的版本控制
         struct_versions = self._detect_structure_versioning()
-        if struct_versions['has_versioning']:
+        if struct_versions.has_versioning:
             # 可能有多種版本控制方式
             if versioning_info['has_versioning']:
                 versioning_info['versioning_issues'].append({
@@ -86,40 +751,117 @@ class APIVersioningHelper:
                 versioning_info['versioning_scheme'] = 'structure'
             
             # 更新版本資訊
-            versioning_info['detected_versions'].update(struct_versions['versions'])
-            for version, count in struct_versions['distribution'].items():
-                if version in versioning_info['version_distribution']:
-                    versioning_info['version_distribution'][version] += count
-                else:
-                    versioning_info['version_distribution'][version] = count
+            versioning_info['detected_versions'].update(struct_versions.versions)
+            versioning_info['version_distribution'].update(struct_versions.distribution)
             
-            versioning_info['structure_examples'] = struct_versions['examples']
+            versioning_info['structure_examples'] = struct_versions.examples
         
         # 識別版本控制的問題
         self._identify_versioning_issues(versioning_info)
         
+        # 對外返回普通字典
+        versioning_info['version_distribution'] = dict(versioning_info['version_distribution'])
+        
+        self._status_cache = versioning_info
+        self._store_cached_status(cache_path, fingerprint, versioning_info)
         return versioning_info
     
-    def _detect_url_path_versioning(self) -> Dict[str, Any]:
+    def _status_cache_path(self) -> Optional[str]:
+        """
+        取得版本控制分析結果的磁碟快取路徑
+        
+        設定環境變數 VERSIONING_CACHE_DISABLE=1 可停用快取。
+        
+        Returns:
+            快取文件路徑，停用快取時返回 None
+        """
+        if os.environ.get('VERSIONING_CACHE_DISABLE') == '1':
+            return None
+        
+        key = repr((_STATUS_CACHE_VERSION, os.path.abspath(self.project_path)))
+        digest = hashlib.blake2b(key.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+        return os.path.join(_STATUS_CACHE_DIR, f'{digest}.pkl')
+    
+    def _fingerprint(self) -> str:
+        """
+        計算專案的指紋（目錄結構與 Python 文件的修改時間和大小）
+        
+        Returns:
+            專案指紋的十六進位字串
+        """
+        self._scan_project()
+        digest = hashlib.blake2b(digest_size=16)
+        for root, dirs in self._dirs_by_parent.items():
+            rel_root = os.path.relpath(root, self.project_path)
+            digest.update(repr((rel_root, dirs)).encode('utf-8', 'surrogatepass'))
+            for file in self._py_files_by_dir[root]:
+                try:
+                    stat = os.stat(os.path.join(root, file))
+                except OSError:
+                    continue
+                digest.update(repr((file, stat.st_mtime_ns, stat.st_size)).encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+    
+    def _load_cached_status(self, cache_path: Optional[str], fingerprint: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        從磁碟快取載入版本控制分析結果
+        
+        Args:
+            cache_path: 快取文件路徑
+            fingerprint: 目前的專案指紋
+            
+        Returns:
+            快取的分析結果，未命中、指紋不符或快取損壞時返回 None
+        """
+        if cache_path is None:
+            return None
+        
+        try:
+            with open(cache_path, 'rb') as file:
+                payload = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError, ValueError):
+            return None
+        
+        if not isinstance(payload, dict) or payload.get('fingerprint') != fingerprint:
+            return None
+        return payload.get('status')
+    
+    def _store_cached_status(self, cache_path: Optional[str], fingerprint: Optional[str], status: Dict[str, Any]) -> None:
+        """
+        將版本控制分析結果寫入磁碟快取（先寫入暫存檔再原子替換）
+        
+        Args:
+            cache_path: 快取文件路徑
+            fingerprint: 專案指紋
+            status: 版本控制分析結果
+        """
+        if cache_path is None:
+            return
+        
+        try:
+            os.makedirs(_STATUS_CACHE_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=_STATUS_CACHE_DIR, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as file:
+                    pickle.dump({'fingerprint': fingerprint, 'status': status}, file, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, pickle.PicklingError, RecursionError):
+            # 快取只是加速手段，寫入失敗不影響分析結果
+            pass
+    
+    def _detect_url_path_versioning(self) -> _DetectorResult:
         """
         檢測 URL 路徑中的版本控制
         
         Returns:
-            URL 路徑版本控制資訊的字典
+            URL 路徑版本控制資訊
         """
-        result = {
-            'has_versioning': False,
-            'versions': set(),
-            'distribution': {},
-            'examples': []
-        }
+        result = _DetectorResult()
         
-        # 版本模式正則表達式
-        version_patterns = [
-            r'/v(\d+)/',  # 例如 /v1/users
-            r'/api/v(\d+)/',  # 例如 /api/v1/users
-            r'/api/(\d+\.\d+)/'  # 例如 /api/1.0/users
-        ]
+        examples_full = False
         
         # 檢查每個端點
         for endpoint in self.endpoints:
@@ -129,158 +871,170 @@ class APIVersioningHelper:
             if not path:
                 continue
             
-            # 檢查每個版本模式
-            for pattern in version_patterns:
-                match = re.search(pattern, path)
-                if match:
-                    # 提取版本號
-                    version = match.group(1)
-                    result['has_versioning'] = True
-                    result['versions'].add(version)
-                    
-                    # 更新分布
-                    if version in result['distribution']:
-                        result['distribution'][version] += 1
-                    else:
-                        result['distribution'][version] = 1
-                    
-                    # 添加範例
-                    if len(result['examples']) < 5:  # 限制範例數量
-                        result['examples'].append({
-                            'path': path,
-                            'version': version,
-                            'pattern': pattern
-                        })
-                    
-                    break  # 找到一個匹配就跳出內部循環
+            # 以單次匹配檢查所有版本模式
+            match = _URL_VERSION_RE.match(path)
+            if not match:
+                continue
+            
+            # 提取版本號
+            version = sys.intern(match.group(match.lastgroup))
+            result.has_versioning = True
+            result.versions.add(version)
+            
+            # 更新分布
+            result.distribution[version] += 1
+            
+            # 添加範例（達到數量上限後不再建立範例）
+            if not examples_full:
+                result.examples.append({
+                    'path': path,
+                    'version': version,
+                    'pattern': _URL_VERSION_PATTERN_TEXT[match.lastgroup]
+                })
+                examples_full = len(result.examples) >= 5  # 限制範例數量
         
         return result
     
-    def _detect_header_versioning(self) -> Dict[str, Any]:
+    def _detect_header_versioning(self) -> _DetectorResult:
         """
         檢測基於標頭/參數的版本控制
         
         Returns:
-            標頭版本控制資訊的字典
+            標頭版本控制資訊
         """
-        result = {
-            'has_versioning': False,
-            'versions': set(),
-            'distribution': {},
-            'examples': []
-        }
+        result = _DetectorResult()
         
-        # 搜尋所有 Python 文件中的標頭/參數版本處理程式碼
-        version_headers = ['api-version', 'x-api-version', 'accept-version', 'version']
-        version_params = ['version', 'api_version', 'v']
+        # 搜尋所有 Python 文件中的標頭/參數版本處理程式碼；文件數量多時以執行緒池並行掃描
+        py_files = self._iter_py_files()
+        if len(py_files) >= _PARALLEL_MIN_FILES:
+            with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 4) * 2)) as executor:
+                scans = list(executor.map(self._scan_one_file, py_files))
+        else:
+            scans = [self._scan_one_file(file_path) for file_path in py_files]
         
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    content = read_file(file_path)
-                    
-                    # 檢查是否包含與版本標頭或參數相關的代碼
-                    has_header_code = any(re.search(rf'[\'\"]?{header}[\'\"]?', content, re.IGNORECASE) for header in version_headers)
-                    has_param_code = any(re.search(rf'[\'\"]?{param}[\'\"]?', content, re.IGNORECASE) for param in version_params)
-                    
-                    if has_header_code or has_param_code:
-                        try:
-                            # 嘗試提取版本號
-                            version_matches = re.findall(r'[\'\"]v?(\d+(\.\d+)?)[\'\"]', content)
-                            
-                            if version_matches:
-                                result['has_versioning'] = True
-                                
-                                for match in version_matches:
-                                    version = match[0]
-                                    result['versions'].add(version)
-                                    
-                                    # 更新分布
-                                    if version in result['distribution']:
-                                        result['distribution'][version] += 1
-                                    else:
-                                        result['distribution'][version] = 1
-                                
-                                # 添加範例
-                                if len(result['examples']) < 5:  # 限制範例數量
-                                    header_text = "Custom header" if has_header_code else "Query parameter"
-                                    result['examples'].append({
-                                        'file': file_path,
-                                        'version_type': header_text,
-                                        'versions': list(version for version, _ in version_matches)
-                                    })
-                        except Exception:
-                            continue
+        examples_full = False
+        
+        # 按文件順序彙總結果
+        for scan in scans:
+            if scan is None:
+                continue
+            
+            file_path, header_text, version_matches = scan
+            result.has_versioning = True
+            
+            result.versions.update(version_matches)
+            
+            # 更新分布
+            result.distribution.update(version_matches)
+            
+            # 添加範例（達到數量上限後不再建立範例）
+            if not examples_full:
+                result.examples.append({
+                    'file': file_path,
+                    'version_type': header_text,
+                    'versions': version_matches
+                })
+                examples_full = len(result.examples) >= 5  # 限制範例數量
         
         return result
     
-    def _detect_structure_versioning(self) -> Dict[str, Any]:
+    def _scan_one_file(self, file_path: str) -> Optional[Tuple[str, str, List[str]]]:
+        """
+        掃描單一文件中的標頭/參數版本處理程式碼
+        
+        Args:
+            file_path: 文件路徑
+            
+        Returns:
+            (文件路徑, 版本類型, 版本號列表)，文件中沒有相關代碼或版本號時返回 None
+        """
+        content = self._read_bytes_cached(file_path)
+        
+        # 先以子字串預先篩選，再執行較昂貴的正則匹配
+        if not any(gate in content for gate in _VERSION_CODE_GATES):
+            return None
+        
+        # 檢查是否包含與版本標頭或參數相關的代碼
+        match = _HEADER_OR_PARAM_RE.search(content)
+        if not match:
+            return None
+        
+        # 所有標頭名稱都包含 'version'，首個匹配僅為參數名稱時，
+        # 只需確認其後是否仍出現 'version'
+        has_header_code = (
+            match.group('name').lower() in _VERSION_HEADERS
+            or b'version' in content[match.start() + 1:].lower()
+        )
+        # 提取版本號
+        version_matches = [sys.intern(m.group(1).decode('ascii')) for m in _QUOTED_VERSION_RE.finditer(content)]
+        if not version_matches:
+            return None
+        
+        header_text = "Custom header" if has_header_code else "Query parameter"
+        return file_path, header_text, version_matches
+    
+    def _detect_structure_versioning(self) -> _DetectorResult:
         """
         檢測檔案/目錄結構中的版本控制
         
         Returns:
-            結構版本控制資訊的字典
+            結構版本控制資訊
         """
-        result = {
-            'has_versioning': False,
-            'versions': set(),
-            'distribution': {},
-            'examples': []
-        }
+        result = _DetectorResult()
         
-        # 檢查目錄結構
-        version_dir_pattern = re.compile(r'v(\d+(\.\d+)?)')
-        version_file_pattern = re.compile(r'_v(\d+(\.\d+)?)')
+        examples_full = False
         
-        for root, dirs, files in os.walk(self.project_path):
+        # 檢查目錄結構（使用已建立的目錄索引，無需再次列出目錄）
+        self._scan_project()
+        for root, dirs in self._dirs_by_parent.items():
             # 檢查目錄名
             for directory in dirs:
-                match = version_dir_pattern.match(directory)
+                # 模式錨定於開頭的 v，先以字串前綴篩選
+                if not directory.startswith('v'):
+                    continue
+                match = _VERSION_DIR_RE.match(directory)
                 if match:
-                    version = match.group(1)
-                    result['has_versioning'] = True
-                    result['versions'].add(version)
+                    version = sys.intern(match.group(1))
+                    result.has_versioning = True
+                    result.versions.add(version)
                     
                     # 檢查目錄中的 Python 文件數量
                     version_dir = os.path.join(root, directory)
-                    py_files_count = sum(1 for f in os.listdir(version_dir) if f.endswith('.py'))
+                    py_files_count = len(self._py_files_by_dir.get(version_dir, ()))
                     
                     # 更新分布
-                    if version in result['distribution']:
-                        result['distribution'][version] += py_files_count
-                    else:
-                        result['distribution'][version] = py_files_count
+                    result.distribution[version] += py_files_count
                     
-                    # 添加範例
-                    if len(result['examples']) < 5:  # 限制範例數量
-                        result['examples'].append({
+                    # 添加範例（達到數量上限後不再建立範例）
+                    if not examples_full:
+                        result.examples.append({
                             'directory': os.path.join(root, directory),
                             'version': version,
                             'files_count': py_files_count
                         })
+                        examples_full = len(result.examples) >= 5  # 限制範例數量
             
             # 檢查文件名
-            for file in files:
-                if file.endswith('.py'):
-                    match = version_file_pattern.search(file)
-                    if match:
-                        version = match.group(1)
-                        result['has_versioning'] = True
-                        result['versions'].add(version)
-                        
-                        # 更新分布
-                        if version in result['distribution']:
-                            result['distribution'][version] += 1
-                        else:
-                            result['distribution'][version] = 1
-                        
-                        # 添加範例
-                        if len(result['examples']) < 5:  # 限制範例數量
-                            result['examples'].append({
-                                'file': os.path.join(root, file),
-                                'version': version
-                            })
+            for file in self._py_files_by_dir[root]:
+                # 大多數文件名不含 _v，無需進入正則匹配
+                if '_v' not in file:
+                    continue
+                match = _VERSION_FILE_RE.search(file)
+                if match:
+                    version = sys.intern(match.group(1))
+                    result.has_versioning = True
+                    result.versions.add(version)
+                    
+                    # 更新分布
+                    result.distribution[version] += 1
+                    
+                    # 添加範例（達到數量上限後不再建立範例）
+                    if not examples_full:
+                        result.examples.append({
+                            'file': os.path.join(root, file),
+                            'version': version
+                        })
+                        examples_full = len(result.examples) >= 5  # 限制範例數量
         
         return result
     
@@ -304,12 +1058,19 @@ class APIVersioningHelper:
         # 檢查版本號一致性
         version_formats = set()
         for version in versioning_info['detected_versions']:
-            if re.match(r'^\d+$', version):
+            # isdecimal 與正則的 \d 接受相同的數字字元
+            if version.isdecimal():
                 version_formats.add('integer')
-            elif re.match(r'^\d+\.\d+$', version):
-                version_formats.add('decimal')
             else:
-                version_formats.add('other')
+                major, dot, minor = version.partition('.')
+                if dot and major.isdecimal() and minor.isdecimal():
+                    version_formats.add('decimal')
+                else:
+                    version_formats.add('other')
+            
+            # 只需知道是否存在多種格式
+            if len(version_formats) > 1:
+                break
         
         if len(version_formats) > 1:
             versioning_info['versioning_issues'].append({
@@ -332,15 +1093,19 @@ class APIVersioningHelper:
                     'recommendation': '確保新版本提供與舊版本相當的功能覆蓋，並考慮棄用老舊版本。'
                 })
     
-    def suggest_versioning_strategy(self) -> Dict[str, Any]:
+    def suggest_versioning_strategy(self, current_status: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         建議版本控制策略
         
+        Args:
+            current_status: 已取得的版本控制狀態（可選，未提供時自動分析）
+            
         Returns:
             版本控制策略建議的字典
         """
         # 首先分析當前版本控制狀態
-        current_status = self.analyze_versioning_status()
+        if current_status is None:
+            current_status = self.analyze_versioning_status()
         
         # 根據框架和當前狀態推薦策略
         recommendation = {
@@ -452,40 +1217,7 @@ class APIVersioningHelper:
                 '在 URL 路由中包含版本前綴',
                 '使用 default_version 設置預設版本'
             ],
-            'code_example': '''
-# settings.py
-REST_FRAMEWORK = {
-    'DEFAULT_VERSIONING_CLASS': 'rest_framework.versioning.URLPathVersioning',
-    'DEFAULT_VERSION': 'v1',
-    'ALLOWED_VERSIONS': ['v1', 'v2'],
-    'VERSION_PARAM': 'version',
-}
-
-# urls.py
-from django.urls import path, include
-from rest_framework.routers import DefaultRouter
-from . import views
-
-router = DefaultRouter()
-router.register(r'users', views.UserViewSet)
-
-urlpatterns = [
-    path('api/<str:version>/', include(router.urls)),
-]
-
-# views.py
-from rest_framework import viewsets
-from rest_framework.response import Response
-
-class UserViewSet(viewsets.ModelViewSet):
-    def list(self, request, *args, **kwargs):
-        if request.version == 'v1':
-            # v1 implementation
-            return Response({"message": "This is API v1"})
-        elif request.version == 'v2':
-            # v2 implementation
-            return Response({"message": "This is API v2"})
-'''
+            'code_example': _DJANGO_URL_PATH_EXAMPLE
         }
     
     def _get_flask_versioning_guide(self) -> Dict[str, Any]:
@@ -497,49 +1229,14 @@ class UserViewSet(viewsets.ModelViewSet):
         """
         return {
             'title': 'Flask API 版本控制指南',
-            'description': '使用 Flask 藍圖或路由來實施 API 版本控制',
-            'recommendations': [
-                '為每個 API 版本創建單獨的藍圖',
-                '在 URL 前綴中包含版本號',
-                '集中管理版本信息',
-                '根據版本選擇適當的處理邏輯'
-            ],
-            'code_example': '''
-# Using Flask Blueprints for versioning
-from flask import Flask, Blueprint, jsonify
-
-app = Flask(__name__)
-
-# Create blueprints for different versions
-v1_blueprint = Blueprint('v1', __name__, url_prefix='/api/v1')
-v2_blueprint = Blueprint('v2', __name__, url_prefix='/api/v2')
-
-@v1_blueprint.route('/users')
-def get_users_v1():
-    # v1 implementation
-    return jsonify({"message": "This is API v1"})
-@v2_blueprint.route('/users')
-def get_users_v2():
-    # v2 implementation
-    return jsonify({"message": "This is API v2", "data": {"enhanced": True}})
-
-# Register blueprints
-app.register_blueprint(v1_blueprint)
-app.register_blueprint(v2_blueprint)
-
-# Alternative approach with version as URL parameter
-@app.route('/api/users')
-def get_users():
-    version = request.args.get('version', '1')
-    if version == '1':
-        # v1 implementation
-        return jsonify({"message": "This is API v1"})
-    elif version == '2':
-        # v2 implementation
-        return jsonify({"message": "This is API v2", "data": {"enhanced": True}})
-    else:
-        return jsonify({"error": "Unsupported API version"}), 400
-'''
+            'description': '使用 Flask 藍圖或路由來實施 API 版本控制',
+            'recommendations': [
+                '為每個 API 版本創建單獨的藍圖',
+                '在 URL 前綴中包含版本號',
+                '集中管理版本信息',
+                '根據版本選擇適當的處理邏輯'
+            ],
+            'code_example': _FLASK_URL_PATH_EXAMPLE
         }
     
     def _get_fastapi_versioning_guide(self) -> Dict[str, Any]:
@@ -558,43 +1255,7 @@ def get_users():
                 '利用依賴注入處理版本特定邏輯',
                 '使用標籤分組相關端點'
             ],
-            'code_example': '''
-from fastapi import FastAPI, APIRouter, Depends, Header
-
-app = FastAPI()
-
-# Create routers for different versions
-v1_router = APIRouter(prefix="/api/v1", tags=["v1"])
-v2_router = APIRouter(prefix="/api/v2", tags=["v2"])
-
-# Version 1 endpoints
-@v1_router.get("/users")
-async def get_users_v1():
-    # v1 implementation
-    return {"message": "This is API v1"}
-
-# Version 2 endpoints with enhanced features
-@v2_router.get("/users")
-async def get_users_v2():
-    # v2 implementation
-    return {"message": "This is API v2", "data": {"enhanced": True}}
-
-# Include routers
-app.include_router(v1_router)
-app.include_router(v2_router)
-
-# Alternative approach with header versioning
-@app.get("/api/users")
-async def get_users(api_version: str = Header("1.0")):
-    if api_version.startswith("1"):
-        # v1 implementation
-        return {"message": "This is API v1"}
-    elif api_version.startswith("2"):
-        # v2 implementation
-        return {"message": "This is API v2", "data": {"enhanced": True}}
-    else:
-        return {"error": "Unsupported API version"}
-'''
+            'code_example': _FASTAPI_URL_PATH_EXAMPLE
         }
     
     def _get_generic_versioning_guide(self) -> Dict[str, Any]:
@@ -669,183 +1330,11 @@ async def get_users(api_version: str = Header("1.0")):
         Returns:
             代碼示例
         """
-        if framework == 'django':
-            if scheme == 'url_path':
-                return self._get_django_versioning_guide()['code_example']
-            elif scheme == 'http_header':
-                return '''
-# settings.py
-REST_FRAMEWORK = {
-    'DEFAULT_VERSIONING_CLASS': 'rest_framework.versioning.AcceptHeaderVersioning',
-    'DEFAULT_VERSION': '1.0',
-    'ALLOWED_VERSIONS': ['1.0', '2.0'],
-    'VERSION_PARAM': 'version',
-}
-
-# views.py
-from rest_framework import viewsets
-from rest_framework.response import Response
-
-class UserViewSet(viewsets.ModelViewSet):
-    def list(self, request, *args, **kwargs):
-        if request.version == '1.0':
-            # v1.0 implementation
-            return Response({"message": "This is API v1.0"})
-        elif request.version == '2.0':
-            # v2.0 implementation
-            return Response({"message": "This is API v2.0"})
-'''
-            else:  # structure
-                return '''
-# api/v1/views.py
-from rest_framework import viewsets
-from rest_framework.response import Response
-
-class UserViewSet(viewsets.ModelViewSet):
-    def list(self, request):
-        return Response({"message": "This is API v1"})
-
-# api/v2/views.py
-from rest_framework import viewsets
-from rest_framework.response import Response
-
-class UserViewSet(viewsets.ModelViewSet):
-    def list(self, request):
-        return Response({"message": "This is API v2", "data": {"enhanced": True}})
-
-# urls.py
-from django.urls import path, include
-from rest_framework.routers import DefaultRouter
-from api.v1 import views as v1_views
-from api.v2 import views as v2_views
-
-v1_router = DefaultRouter()
-v1_router.register(r'users', v1_views.UserViewSet)
-
-v2_router = DefaultRouter()
-v2_router.register(r'users', v2_views.UserViewSet)
-
-urlpatterns = [
-    path('api/v1/', include(v1_router.urls)),
-    path('api/v2/', include(v2_router.urls)),
-]
-'''
-        elif framework == 'flask':
-            if scheme == 'url_path':
-                return self._get_flask_versioning_guide()['code_example']
-            elif scheme == 'http_header':
-                return '''
-from flask import Flask, jsonify, request
-
-app = Flask(__name__)
-
-@app.route('/api/users')
-def get_users():
-    # Check API version from header
-    api_version = request.headers.get('X-API-Version', '1.0')
-    
-    if api_version == '1.0':
-        # v1.0 implementation
-        return jsonify({"message": "This is API v1.0"})
-    elif api_version == '2.0':
-        # v2.0 implementation
-        return jsonify({"message": "This is API v2.0", "data": {"enhanced": True}})
-    else:
-        return jsonify({"error": "Unsupported API version"}), 400
-'''
-            else:  # structure
-                return '''
-# api/v1/users.py
-from flask import Blueprint, jsonify
-
-v1_users = Blueprint('v1_users', __name__)
-
-@v1_users.route('/users')
-def get_users():
-    return jsonify({"message": "This is API v1"})
-
-# api/v2/users.py
-from flask import Blueprint, jsonify
-
-v2_users = Blueprint('v2_users', __name__)
-
-@v2_users.route('/users')
-def get_users():
-    return jsonify({"message": "This is API v2", "data": {"enhanced": True}})
-
-# app.py
-from flask import Flask
-from api.v1.users import v1_users
-from api.v2.users import v2_users
-
-app = Flask(__name__)
-app.register_blueprint(v1_users, url_prefix='/api/v1')
-app.register_blueprint(v2_users, url_prefix='/api/v2')
-'''
-        elif framework == 'fastapi':
-            if scheme == 'url_path':
-                return self._get_fastapi_versioning_guide()['code_example']
-            elif scheme == 'http_header':
-                return '''
-from fastapi import FastAPI, Header
-
-app = FastAPI()
-
-@app.get("/api/users")
-async def get_users(x_api_version: str = Header("1.0", alias="X-API-Version")):
-    if x_api_version == "1.0":
-        # v1.0 implementation
-        return {"message": "This is API v1.0"}
-    elif x_api_version == "2.0":
-        # v2.0 implementation
-        return {"message": "This is API v2.0", "data": {"enhanced": True}}
-    else:
-        return {"error": "Unsupported API version"}
-'''
-            else:  # structure
-                return '''
-# app/api/v1/users.py
-from fastapi import APIRouter
-
-router = APIRouter()
-
-@router.get("/users")
-async def get_users():
-    return {"message": "This is API v1"}
-
-# app/api/v2/users.py
-from fastapi import APIRouter
-
-router = APIRouter()
-
-@router.get("/users")
-async def get_users():
-    return {"message": "This is API v2", "data": {"enhanced": True}}
-
-# main.py
-from fastapi import FastAPI
-from app.api.v1 import users as users_v1
-from app.api.v2 import users as users_v2
-
-app = FastAPI()
-
-app.include_router(users_v1.router, prefix="/api/v1")
-app.include_router(users_v2.router, prefix="/api/v2")
-'''
-        else:
+        examples = _CODE_EXAMPLES.get(framework)
+        if examples is None:
             # 通用示例，使用偽代碼
-            return '''
-// URL path versioning example
-GET /api/v1/users
-GET /api/v2/users
-
-// HTTP header versioning example
-GET /api/users
-Header: X-API-Version: 1.0
-
-// Query parameter versioning
-GET /api/users?version=1.0
-'''
+            return _GENERIC_CODE_EXAMPLE
+        return examples.get(scheme, examples['structure'])
     
     def _generate_migration_steps(self, current_status: Dict[str, Any], target_scheme: str) -> List[Dict[str, Any]]:
         """
@@ -858,69 +1347,43 @@ GET /api/users?version=1.0
         Returns:
             遷移步驟列表
         """
-        steps = []
+        has_versioning = current_status['has_versioning']
+        current_scheme = current_status['versioning_scheme']
         
         # 如果已經使用目標方案，則提供改進步驟
-        if current_status['has_versioning'] and current_status['versioning_scheme'] == target_scheme:
-            steps.append({
+        if has_versioning and current_scheme == target_scheme:
+            steps = [{
                 'title': '審查和標準化現有版本控制',
-                'description': '您已經在使用 ' + target_scheme + ' 版本控制，但可能需要標準化實施。',
-                'tasks': [
-                    '確保所有端點都一致地使用版本控制',
-                    '採用統一的版本格式（推薦 MAJOR.MINOR）',
-                    '為所有支援的版本提供適當的文檔',
-                    '為不再維護的版本制定棄用策略'
-                ]
-            })
+                'description': f'您已經在使用 {target_scheme} 版本控制，但可能需要標準化實施。',
+                'tasks': list(_STANDARDIZE_TASKS)
+            }]
+        elif not has_versioning:
+            # 從頭開始實施版本控制
+            steps = [{
+                'title': '實施初始版本控制',
+                'description': '為 API 建立基本版本控制架構。',
+                'tasks': list(_INITIAL_VERSIONING_TASKS)
+            }]
         else:
-            # 如果需要切換方案或從頭開始實施
-            if not current_status['has_versioning']:
-                # 從頭開始實施版本控制
-                steps.append({
-                    'title': '實施初始版本控制',
-                    'description': '為 API 建立基本版本控制架構。',
-                    'tasks': [
-                        '選擇初始版本號（推薦從 v1 或 1.0 開始）',
-                        '更新路由/端點定義以包含版本信息',
-                        '更新文檔以反映版本化 API',
-                        '在所有 API 客戶端通訊中提及版本控制'
-                    ]
-                })
-            else:
-                # 從一個方案切換到另一個方案
-                steps.append({
-                    'title': '從 ' + current_status['versioning_scheme'] + ' 遷移到 ' + target_scheme,
+            # 從一個方案切換到另一個方案，並逐步棄用舊方案
+            steps = [
+                {
+                    'title': f'從 {current_scheme} 遷移到 {target_scheme}',
                     'description': '謹慎地更改版本控制方案以最小化客戶端影響。',
-                    'tasks': [
-                        '創建新的版本化端點或處理邏輯',
-                        '保持現有端點正常運作以向後兼容',
-                        '設置重定向或橋接處理程式',
-                        '更新文檔以解釋兩種方案'
-                    ]
-                })
-                
-                steps.append({
+                    'tasks': list(_SCHEME_SWITCH_TASKS)
+                },
+                {
                     'title': '逐步棄用舊版本控制方案',
                     'description': '給客戶端足夠的時間來遷移到新方案。',
-                    'tasks': [
-                        '宣布棄用時間表（建議至少 6 個月）',
-                        '在舊端點回應中添加棄用通知',
-                        '監測舊端點使用情況',
-                        '在棄用期結束時實施日落策略'
-                    ]
-                })
+                    'tasks': list(_SCHEME_DEPRECATION_TASKS)
+                }
+            ]
         
         # 添加版本控制最佳實踐步驟
         steps.append({
             'title': '實施版本控制最佳實踐',
             'description': '確保您的版本控制策略可持續且符合標準。',
-            'tasks': [
-                '建立清晰的版本控制策略和向後兼容性指導方針',
-                '使用語義版本控制原則 (SemVer) 管理版本號',
-                '為所有 API 更改維護詳細的變更日誌',
-                '實施自動化測試以驗證各版本的端點行為',
-                '為關鍵 API 客戶端提供遷移指南和支援'
-            ]
+            'tasks': list(_BEST_PRACTICE_TASKS)
         })
         
         return steps
@@ -929,21 +1392,26 @@ GET /api/users?version=1.0
         self,
         current_version: str,
         target_version: str,
-        breaking_changes: List[Dict[str, Any]] = None
+        breaking_changes: List[Dict[str, Any]] = None,
+        current_status: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         生成 API 版本升級計劃
         
+        分析結果快取於實例上，連續生成多個計劃時只會掃描專案一次。
+        
         Args:
             current_version: 當前版本
             target_version: 目標版本
             breaking_changes: 破壞性更改列表（可選）
+            current_status: 已取得的版本控制狀態（可選，未提供時自動分析）
             
         Returns:
             版本升級計劃
         """
         # 分析當前版本控制狀態
-        current_status = self.analyze_versioning_status()
+        if current_status is None:
+            current_status = self._get_status()
         
         # 初始化升級計劃
         upgrade_plan = {
@@ -958,7 +1426,7 @@ GET /api/users?version=1.0
         
         # 生成階段性升級計劃
         upgrade_plan['upgrade_phases'] = self._generate_upgrade_phases(
-            current_version, target_version, current_status['versioning_scheme'], breaking_changes
+            current_version, target_version, breaking_changes
         )
         
         # 生成客戶端遷移指南
@@ -977,7 +1445,6 @@ GET /api/users?version=1.0
         self,
         current_version: str,
         target_version: str,
-        versioning_scheme: str,
         breaking_changes: Optional[List[Dict[str, Any]]]
     ) -> List[Dict[str, Any]]:
         """
@@ -986,92 +1453,16 @@ GET /api/users?version=1.0
         Args:
             current_version: 當前版本
             target_version: 目標版本
-            versioning_scheme: 版本控制方案
             breaking_changes: 破壞性更改列表
             
         Returns:
             升級階段列表
         """
-        phases = []
-        
-        # 規劃階段
-        phases.append({
-            'name': '規劃與準備',
-            'description': '定義範圍並準備升級工作',
-            'tasks': [
-                '完整記錄所有計劃更改，尤其是破壞性更改',
-                '為現有端點和預期端點建立完整的測試套件',
-                '建立詳細的回滾計劃',
-                '與 API 消費者溝通升級時間表',
-                '準備版本化的路由結構'
-            ]
-        })
-        
-        # 實現新版本端點
-        phases.append({
-            'name': f'實現 {target_version} 端點',
-            'description': '同時維護舊版和新版 API',
-            'tasks': [
-                f'創建新的 {target_version} 端點結構',
-                '實現所有端點的新版本',
-                '為新功能添加新端點',
-                '為破壞性更改重新設計受影響的端點',
-                '更新文檔以反映新端點'
-            ]
-        })
-        
-        # 測試階段
-        phases.append({
-            'name': '測試與驗證',
-            'description': '確保新版 API 滿足所有需求',
-            'tasks': [
-                '對所有新端點執行單元和整合測試',
-                '進行性能測試以確保與或優於當前版本',
-                '進行安全測試',
-                '邀請合作夥伴進行 beta 測試',
-                '驗證向後兼容性（如果承諾）'
-            ]
-        })
-        
-        # 部署階段
-        phases.append({
-            'name': '部署與發布',
-            'description': '向用戶發布新版本',
-            'tasks': [
-                f'部署 {target_version} API 端點到生產環境',
-                '設置監控和警報',
-                '發布版本公告和文檔',
-                '持續監測使用情況和性能',
-                '準備支援團隊處理可能的問題'
-            ]
-        })
-        
-        # 遷移階段
-        phases.append({
-            'name': '客戶端遷移',
-            'description': '協助客戶端遷移到新版本',
-            'tasks': [
-                '提供詳細的遷移指南',
-                '提供遷移工具（如果適用）',
-                '提供支援渠道',
-                '監測舊版 API 的使用情況',
-                '與關鍵客戶合作進行遷移'
-            ]
-        })
+        phases = [template.as_dict(current_version, target_version) for template in _UPGRADE_PHASE_TEMPLATES]
         
         # 如果有破壞性更改，添加棄用階段
         if breaking_changes:
-            phases.append({
-                'name': f'棄用 {current_version}',
-                'description': '逐步淘汰舊版 API',
-                'tasks': [
-                    f'設定 {current_version} 的棄用時間表（通常為 6-12 個月）',
-                    '在舊版 API 回應中添加棄用警告',
-                    '隨著時間的推移降低舊版 API 的服務等級',
-                    '定期向仍使用舊版 API 的客戶端發送提醒',
-                    f'在棄用日期後停用 {current_version} 端點'
-                ]
-            })
+            phases.append(_DEPRECATION_PHASE_TEMPLATE.as_dict(current_version, target_version))
         
         return phases
     
@@ -1101,47 +1492,29 @@ GET /api/users?version=1.0
                 'end_of_support': '待定'
             },
             'general_steps': [
-                f'更新 API 客戶端中的版本引用（從 {current_version} 到 {target_version}）',
-                '測試所有 API 調用以確保兼容性',
-                '利用新特性和改進',
-                '移除任何不再支援的功能的使用'
+                fill_template(step, current_version, target_version) for step in _CLIENT_MIGRATION_STEPS
             ],
             'changes': []
         }
         
-        # 添加特定更改
+        # 添加特定更改（只保留指南所需的欄位，其餘欄位不帶入）
         if breaking_changes:
-            for change in breaking_changes:
-                guide['changes'].append({
+            guide['changes'] = [
+                {
                     'type': change.get('type', 'unknown'),
                     'description': change.get('description', ''),
-                    'migration_action': change.get('migration_action', '修改您的客戶端代碼以適應此更改')
-                })
+                    'migration_action': change.get('migration_action', _DEFAULT_MIGRATION_ACTION)
+                }
+                for change in breaking_changes
+            ]
         else:
             # 假設的更改示例
             guide['changes'] = [
-                {
-                    'type': 'endpoint_path',
-                    'description': '某些端點路徑可能已更改',
-                    'migration_action': '更新您的 API 調用中的所有端點 URL'
-                },
-                {
-                    'type': 'request_format',
-                    'description': '請求和回應格式可能已更改',
-                    'migration_action': '確保您的 API 調用使用正確的請求格式，並能正確處理新的回應格式'
-                },
-                {
-                    'type': 'new_features',
-                    'description': f'{target_version} 中添加了新功能',
-                    'migration_action': '查看文檔了解如何利用新功能'
-                }
+                change.as_dict(current_version, target_version) for change in _DEFAULT_CLIENT_CHANGES
             ]
         
-        # 添加示例代碼
-        guide['code_samples'] = {
-            'before': f'// API {current_version} 調用示例\nawait fetch("/api/{current_version}/users");',
-            'after': f'// API {target_version} 調用示例\nawait fetch("/api/{target_version}/users");'
-        }
+        # 添加示例代碼（複製快取的唯讀示例，呼叫端可自由修改）
+        guide['code_samples'] = dict(_build_code_samples(current_version, target_version))
         
         return guide
     
@@ -1149,6 +1522,9 @@ GET /api/users?version=1.0
         """
         生成回滾計劃
         
+        內容取自按版本組合快取的唯讀模板，返回的字典與列表都是新建立的，
+        呼叫端可自由修改。
+        
         Args:
             current_version: 當前版本
             target_version: 目標版本
@@ -1156,45 +1532,10 @@ GET /api/users?version=1.0
         Returns:
             回滾計劃
         """
+        template = _build_rollback_plan(current_version, target_version)
         return {
-            'title': f'從 {target_version} 回滾到 {current_version} 的計劃',
-            'triggers': [
-                '關鍵功能無法正常運作',
-                '關鍵性能下降或可用性問題',
-                '安全漏洞',
-                '大量客戶端報告問題'
-            ],
-            'steps': [
-                {
-                    'step': '決策',
-                    'description': '評估問題嚴重程度並做出回滾決定',
-                    'responsible': 'API 產品負責人和技術負責人'
-                },
-                {
-                    'step': '通知',
-                    'description': '通知相關團隊和重要客戶即將進行回滾',
-                    'responsible': '產品和支援團隊'
-                },
-                {
-                    'step': '執行回滾',
-                    'description': f'將流量從 {target_version} 重定向回 {current_version}',
-                    'responsible': '運維團隊'
-                },
-                {
-                    'step': '驗證',
-                    'description': '確認所有端點都已回滾且運作正常',
-                    'responsible': 'QA 團隊'
-                },
-                {
-                    'step': '後續跟進',
-                    'description': '分析回滾原因並制定修復計劃',
-                    'responsible': '開發團隊'
-                }
-            ],
-            'verification_checks': [
-                '端點可達性測試',
-                '基本功能測試',
-                '性能測試',
-                '客戶端連接性測試'
-            ]
-        }
\ No newline at end of file
+            'title': template['title'],
+            'triggers': list(template['triggers']),
+            'steps': [dict(step) for step in template['steps']],
+            'verification_checks': list(template['verification_checks'])
+        }
@@ -0,0 +1,3 @@
+"""
+身份驗證代碼示例模板 - 按框架分模組存放，使用時才導入對應框架的模組
+"""
@@ -0,0 +1,157 @@
+"""
+Django 身份驗證代碼示例 - JWT、OAuth2 與 API 金鑰身份驗證的設置與使用示例
+"""
+from types import MappingProxyType
+from typing import Mapping
+
+
+# JWT 身份驗證的設置與使用示例
+JWT_SETUP = '''
+# settings.py
+INSTALLED_APPS = [
+    # ...
+    'rest_framework',
+    'rest_framework_simplejwt',
+]
+
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'rest_framework_simplejwt.authentication.JWTAuthentication',
+    ],
+}
+
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=15),
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
+    'ROTATE_REFRESH_TOKENS': False,
+    'ALGORITHM': 'HS256',
+    'SIGNING_KEY': SECRET_KEY,
+    'AUTH_HEADER_TYPES': ('Bearer',),
+}
+'''
+
+JWT_USAGE = '''
+# urls.py
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+
+urlpatterns = [
+    # ...
+    path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+]
+
+# views.py
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+
+class ProtectedView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        return Response({"message": "This is a protected endpoint"})
+'''
+
+# OAuth2 身份驗證的設置與使用示例
+OAUTH2_SETUP = '''
+# settings.py
+INSTALLED_APPS = [
+    # ...
+    'oauth2_provider',
+    'rest_framework',
+]
+
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'oauth2_provider.contrib.rest_framework.OAuth2Authentication',
+    ],
+}
+
+OAUTH2_PROVIDER = {
+    'SCOPES': {'read': 'Read scope', 'write': 'Write scope'}
+}
+'''
+
+OAUTH2_USAGE = '''
+# urls.py
+from django.urls import path, include
+
+urlpatterns = [
+    # ...
+    path('o/', include('oauth2_provider.urls', namespace='oauth2_provider')),
+]
+
+# views.py
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from oauth2_provider.contrib.rest_framework import TokenHasReadScope, TokenHasWriteScope
+
+class ProtectedReadView(APIView):
+    permission_classes = [IsAuthenticated, TokenHasReadScope]
+    
+    def get(self, request):
+        return Response({"message": "This is a protected read endpoint"})
+
+class ProtectedWriteView(APIView):
+    permission_classes = [IsAuthenticated, TokenHasWriteScope]
+    
+    def post(self, request):
+        return Response({"message": "This is a protected write endpoint"})
+'''
+
+# API 金鑰身份驗證的設置與使用示例
+API_KEY_SETUP = '''
+# authentication.py
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from .models import APIKey
+
+class APIKeyAuthentication(BaseAuthentication):
+    def authenticate(self, request):
+        api_key = request.META.get('HTTP_X_API_KEY')
+        if not api_key:
+            return None
+        
+        try:
+            key = APIKey.objects.get(key=api_key, is_active=True)
+            return (key.user, None)
+        except APIKey.DoesNotExist:
+            raise AuthenticationFailed('無效的 API 金鑰')
+'''
+
+API_KEY_USAGE = '''
+# settings.py
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'path.to.authentication.APIKeyAuthentication',
+    ],
+}
+
+# views.py
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+
+class ProtectedView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        return Response({"message": "This is a protected endpoint"})
+'''
+
+# 以身份驗證方法為鍵的代碼示例（唯讀，僅供 AuthRefactoringHelper 內部共用；放入計劃前會複製為 dict）
+TEMPLATES: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    'jwt': MappingProxyType({
+        'setup': JWT_SETUP,
+        'usage': JWT_USAGE
+    }),
+    'oauth2': MappingProxyType({
+        'setup': OAUTH2_SETUP,
+        'usage': OAUTH2_USAGE
+    }),
+    'api_key': MappingProxyType({
+        'setup': API_KEY_SETUP,
+        'usage': API_KEY_USAGE
+    })
+})
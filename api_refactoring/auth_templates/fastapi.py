@@ -0,0 +1,154 @@
+"""
+FastAPI 身份驗證代碼示例 - JWT、OAuth2 與 API 金鑰身份驗證的設置與使用示例
+"""
+from types import MappingProxyType
+from typing import Mapping
+
+
+# JWT 身份驗證的設置與使用示例
+JWT_SETUP = '''
+from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError, jwt
+from datetime import datetime, timedelta
+
+# 配置
+SECRET_KEY = os.environ.get("SECRET_KEY")
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = 30
+
+app = FastAPI()
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    to_encode = data.copy()
+    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=15))
+    to_encode.update({"exp": expire})
+    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return encoded_jwt
+'''
+
+JWT_USAGE = '''
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="無效憑證",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        username: str = payload.get("sub")
+        if username is None:
+            raise credentials_exception
+    except JWTError:
+        raise credentials_exception
+    return {"username": username}
+
+@app.post("/token")
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
+    # 驗證用戶
+    if form_data.username != "test" or form_data.password != "test":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="帳號或密碼錯誤"
+        )
+    
+    # 創建令牌
+    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": form_data.username}, expires_delta=access_token_expires
+    )
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@app.get("/users/me")
+async def read_users_me(current_user = Depends(get_current_user)):
+    return current_user
+'''
+
+# OAuth2 身份驗證的設置與使用示例
+OAUTH2_SETUP = '''
+from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from jose import JWTError, jwt
+from datetime import datetime, timedelta
+
+app = FastAPI()
+
+# OAuth2 設置
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+'''
+
+OAUTH2_USAGE = '''
+@app.post("/token")
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
+    # 驗證用戶
+    user = authenticate_user(form_data.username, form_data.password)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="帳號或密碼錯誤",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    # 創建令牌
+    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": user.username, "scopes": form_data.scopes},
+        expires_delta=access_token_expires
+    )
+    return {"access_token": access_token, "token_type": "bearer"}
+
+# 帶作用域的端點
+@app.get("/users/me")
+async def read_users_me(current_user = Depends(get_current_user_with_scopes(['read:profile']))):
+    return current_user
+'''
+
+# API 金鑰身份驗證的設置與使用示例
+API_KEY_SETUP = '''
+from fastapi import FastAPI, Depends, HTTPException, Security, status
+from fastapi.security.api_key import APIKeyHeader, APIKey
+
+app = FastAPI()
+
+API_KEY_NAME = "X-API-Key"
+API_KEY = "your-api-key"  # 在實際應用中，應存儲在安全位置
+
+api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
+
+async def get_api_key(api_key_header: str = Security(api_key_header)):
+    if api_key_header == API_KEY:
+        return api_key_header
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="無效的 API 金鑰"
+        )
+'''
+
+API_KEY_USAGE = '''
+@app.get("/api/protected")
+async def protected_endpoint(api_key: APIKey = Depends(get_api_key)):
+    return {"message": "This is a protected endpoint"}
+
+@app.post("/api/keys")
+async def create_api_key(api_key: APIKey = Depends(get_api_key)):
+    # 創建新的 API 金鑰
+    new_key = generate_api_key()
+    return {"api_key": new_key}
+'''
+
+# 以身份驗證方法為鍵的代碼示例（唯讀，僅供 AuthRefactoringHelper 內部共用；放入計劃前會複製為 dict）
+TEMPLATES: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    'jwt': MappingProxyType({
+        'setup': JWT_SETUP,
+        'usage': JWT_USAGE
+    }),
+    'oauth2': MappingProxyType({
+        'setup': OAUTH2_SETUP,
+        'usage': OAUTH2_USAGE
+    }),
+    'api_key': MappingProxyType({
+        'setup': API_KEY_SETUP,
+        'usage': API_KEY_USAGE
+    })
+})
@@ -0,0 +1,134 @@
+"""
+Flask 身份驗證代碼示例 - JWT、OAuth2 與 API 金鑰身份驗證的設置與使用示例
+"""
+from types import MappingProxyType
+from typing import Mapping
+
+
+# JWT 身份驗證的設置與使用示例
+JWT_SETUP = '''
+from flask import Flask, jsonify, request
+from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
+
+app = Flask(__name__)
+app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY')
+app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=1)
+jwt = JWTManager(app)
+'''
+
+JWT_USAGE = '''
+@app.route('/login', methods=['POST'])
+def login():
+    username = request.json.get('username', None)
+    password = request.json.get('password', None)
+    
+    # 驗證用戶 (在實際應用中，應檢查資料庫中的憑證)
+    if username != 'test' or password != 'test':
+        return jsonify({"msg": "帳號或密碼錯誤"}), 401
+    
+    # 創建 JWT
+    access_token = create_access_token(identity=username)
+    return jsonify(access_token=access_token)
+
+@app.route('/protected', methods=['GET'])
+@jwt_required()
+def protected():
+    # 獲取當前用戶標識
+    current_user = get_jwt_identity()
+    return jsonify(logged_in_as=current_user)
+'''
+
+# OAuth2 身份驗證的設置與使用示例
+OAUTH2_SETUP = '''
+from flask import Flask
+from authlib.integrations.flask_oauth2 import AuthorizationServer, ResourceProtector
+from authlib.integrations.sqla_oauth2 import create_bearer_token_validator
+
+app = Flask(__name__)
+app.config.update({
+    'SQLALCHEMY_DATABASE_URI': 'sqlite:///oauth2.db',
+    'OAUTH2_ACCESS_TOKEN_GENERATOR': 'app.generators.generate_access_token',
+})
+
+# 設置 OAuth2 服務器
+server = AuthorizationServer(app, generate_token=generate_token)
+require_oauth = ResourceProtector()
+bearer_cls = create_bearer_token_validator(db.session, OAuth2TokenMixin)
+require_oauth.register_token_validator(bearer_cls())
+'''
+
+OAUTH2_USAGE = '''
+# 注冊端點
+@app.route('/oauth/token', methods=['POST'])
+def issue_token():
+    return server.create_token_response()
+
+@app.route('/oauth/authorize', methods=['GET', 'POST'])
+def authorize():
+    if request.method == 'GET':
+        # 顯示授權表單
+        return render_template('authorize.html')
+    
+    # 確認授權
+    grant = server.validate_consent_request(end_user=current_user)
+    return server.create_authorization_response(grant_user=current_user)
+
+# 受保護的資源
+@app.route('/api/me')
+@require_oauth('profile')
+def api_me():
+    user = current_token.user
+    return jsonify(id=user.id, username=user.username)
+'''
+
+# API 金鑰身份驗證的設置與使用示例
+API_KEY_SETUP = '''
+from flask import Flask, jsonify, request
+from functools import wraps
+
+app = Flask(__name__)
+
+def require_api_key(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        api_key = request.headers.get('X-API-Key')
+        if not api_key:
+            return jsonify({"error": "API 金鑰缺失"}), 401
+        
+        # 在實際應用中，應檢查資料庫中的金鑰
+        if api_key != "valid_api_key":
+            return jsonify({"error": "無效的 API 金鑰"}), 401
+        
+        return f(*args, **kwargs)
+    return decorated
+'''
+
+API_KEY_USAGE = '''
+@app.route('/api/protected')
+@require_api_key
+def protected():
+    return jsonify({"message": "This is a protected endpoint"})
+
+@app.route('/api/keys', methods=['POST'])
+@require_api_key
+def create_api_key():
+    # 創建新的 API 金鑰
+    new_key = generate_api_key()
+    return jsonify({"api_key": new_key})
+'''
+
+# 以身份驗證方法為鍵的代碼示例（唯讀，僅供 AuthRefactoringHelper 內部共用；放入計劃前會複製為 dict）
+TEMPLATES: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    'jwt': MappingProxyType({
+        'setup': JWT_SETUP,
+        'usage': JWT_USAGE
+    }),
+    'oauth2': MappingProxyType({
+        'setup': OAUTH2_SETUP,
+        'usage': OAUTH2_USAGE
+    }),
+    'api_key': MappingProxyType({
+        'setup': API_KEY_SETUP,
+        'usage': API_KEY_USAGE
+    })
+})
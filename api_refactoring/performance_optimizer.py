@@ -4,10 +4,445 @@ API 性能優化器 - 識別和解決 API 性能問題
 import ast
 import os
 import re
-from typing import Dict, List, Tuple, Optional, Any
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterator, List, Set, Tuple, Optional, Any
 
 from utils.file_operations import read_file, write_file
-from code_analyzer.ast_parser import analyze_python_file
+
+from .performance_rules import RULES, dumps_report_bytes
+
+
+def _loop_query_pattern(**probes: str) -> 're.Pattern[str]':
+    """
+    將多個「循環主體中出現某查詢」的檢測合併為單一正則，用於無法解析語法樹的文件
+    
+    每個探測以可選的前瞻命名群組表示：在循環主體的文字開頭比對一次，
+    群組非 None 即表示主體中出現了對應的查詢，一次比對即可判斷所有探測。
+    比對範圍只限於 _loop_block_hits 擷取的有限行數，不會掃描整個文件。
+    
+    Args:
+        probes: 群組名稱到查詢模式的對應
+        
+    Returns:
+        編譯後的正則
+    """
+    lookaheads = ''.join(f'(?:(?=.*?(?P<{name}>{probe})))?' for name, probe in probes.items())
+    return re.compile(lookaheads, re.DOTALL)
+
+
+# 文件數達到此門檻時才分派到多個行程檢測，避免小專案負擔行程啟動成本
+_PARALLEL_MIN_FILES = 64
+
+# 每個工作行程任務處理的文件數
+_PARALLEL_CHUNK_SIZE = 16
+
+# 超過此字元數的文件（多為生成檔或第三方程式碼）不快取內容，避免同時佔用大量記憶體
+_LARGE_FILE_CHARS = 1 << 20
+
+# 判斷文件是否使用 SQLAlchemy（不分大小寫），避免為此複製整個文件的小寫版本；
+# 限定 ASCII 比對，結果與 'sqlalchemy' in content.lower() 一致
+_SQLALCHEMY_PROBE = re.compile(r'sqlalchemy', re.IGNORECASE | re.ASCII)
+
+# Pydantic 模型中的 @property 計算屬性定義，以及表示已緩存的 cached 字樣
+_PROPERTY_DEF_RE = re.compile(r'@property\s+def\s+\w+\s*\([^)]*\):')
+_CACHED_WORD_RE = re.compile(r'\bcached\b')
+
+# Django 視圖類別定義與分頁大小設定
+_DJANGO_VIEW_CLASS_RE = re.compile(r'class\s+\w+(?:View|ViewSet)\s*\([^)]*\):')
+_PAGE_SIZE_RE = re.compile(r'page_size\s*=\s*(\d+)')
+
+# Flask 路由裝飾器
+_FLASK_ROUTE_RE = re.compile(r'@(?:app|blueprint)\.route\([\'"][^\'"]*[\'"]\)')
+
+# FastAPI GET 端點裝飾器及其 async 函數名稱
+_FASTAPI_GET_ENDPOINT_RE = re.compile(r'@(?:app|router)\.get\([\'"][^\'"]*[\'"]\)\s*async\s+def\s+([^\(]+)\(')
+
+# 回應大小檢查：表示文件定義了端點的標記，以及不加篩選的查詢與對應的規則
+# （以 C 實作的子字串搜尋逐一檢查，比合併為單一正則掃描快得多）
+_ENDPOINT_MARKERS = ('@app', '@route', 'def get')
+_UNFILTERED_QUERIES = (
+    ('.all()', 'unfiltered_all'),
+    ('find({})', 'unfiltered_find'),
+    ('select()', 'unfiltered_select')
+)
+
+# async 函數定義（名稱與參數列表）
+_ASYNC_DEF_RE = re.compile(r'async\s+def\s+(\w+)\s*\([^)]*\)')
+
+# 以嵌套列表推導式生成回應
+_NESTED_LIST_COMP_RE = re.compile(r'\[\s*\[\s*.*?\s*for\s+.*?\s+in\s+.*?\s*\]\s*for\s+')
+
+# 獨佔一行開頭的 for 循環標頭（不跨行比對）；群組 1 為縮排，群組 2 為冒號後同一行的內容
+_FOR_LINE_RE = re.compile(r'^([ \t]*)for[ \t]+\w+[ \t]+in[ \t][^\n]*?:([^\n]*)$', re.MULTILINE)
+
+# 後備檢測時每個循環最多檢查的主體行數，讓比對時間與文件大小成線性關係
+_LOOP_BODY_MAX_LINES = 20
+
+# async 函數定義的關鍵字（FastAPI 後備檢測只檢查其後的循環）
+_ASYNC_DEF_KEYWORD_RE = re.compile(r'async\s+def\b')
+
+# Django 循環中的查詢
+_DJANGO_N_PLUS_ONE_RE = _loop_query_pattern(
+    objects=r'\.objects', filter=r'\.filter', get=r'\.get\('
+)
+_DJANGO_N_PLUS_ONE_CHECKS = (
+    ('objects', 'django_loop_objects'),
+    ('filter', 'django_loop_filter'),
+    ('get', 'django_loop_get')
+)
+
+# Flask（SQLAlchemy）循環中的查詢
+_FLASK_N_PLUS_ONE_RE = _loop_query_pattern(
+    query=r'\.query', session_query=r'session\.query', get=r'\.get\('
+)
+_FLASK_N_PLUS_ONE_CHECKS = (
+    ('query', 'flask_loop_query'),
+    ('session_query', 'flask_loop_session_query'),
+    ('get', 'flask_loop_get')
+)
+
+# FastAPI async 函數中循環內的查詢
+_FASTAPI_N_PLUS_ONE_RE = _loop_query_pattern(
+    get=r'await\s+.*?\.get\(', db=r'await\s+db\.'
+)
+_FASTAPI_N_PLUS_ONE_CHECKS = (
+    ('get', 'fastapi_loop_get'),
+    ('db', 'fastapi_loop_db')
+)
+
+# Django 循環中的個別創建或更新
+_DJANGO_BULK_RE = _loop_query_pattern(
+    create=r'\.objects\.create\(', save=r'\.save\('
+)
+_DJANGO_BULK_CHECKS = (
+    ('create', 'individual_creates'),
+    ('save', 'individual_saves')
+)
+
+# SQLAlchemy 循環中的個別添加或提交
+_SQLALCHEMY_BULK_RE = _loop_query_pattern(
+    add=r'session\.add\(', flush=r'session\.flush\(', commit=r'session\.commit\('
+)
+# flush 與 commit 對應同一規則，同一文件只回報一次
+_SQLALCHEMY_BULK_CHECKS = (
+    ('add', 'individual_adds'),
+    ('flush', 'multiple_commits'),
+    ('commit', 'multiple_commits')
+)
+
+# 以下供端點優化使用：函數定義（群組 1 為函數名稱）；參數列表以前瞻比對，
+# 逐一比對時不會吞掉參數中出現的下一個定義
+_FUNCTION_DEF_RE = re.compile(r'(?:async\s+)?def\s+(\w+)\s*\((?=[^)]*\):)')
+
+# 循環主體中存取的第一個屬性（視為可能的關係欄位）
+_LOOP_FIELD_RE = re.compile(r'for\s+\w+\s+in\s+.*?:\s*.*?\.(\w+)', re.DOTALL)
+
+# Django 的 filter 查詢（群組 1 為模型名稱）
+_DJANGO_FILTER_QUERY_RE = re.compile(r'(\w+)\.objects\.filter\(.*?\)(?:\.\w+\(\))?')
+
+# Flask-SQLAlchemy 的模型查詢（群組 1 為模型名稱）
+_MODEL_QUERY_RE = re.compile(r'(\w+)\.query\.(\w+)\(.*?\)')
+
+# 將 .all() 結果賦值給變數（群組 1 為變數，群組 2 為查詢，可為空）
+_ALL_ASSIGN_RE = re.compile(r'(\w+)\s*=\s*(.*?)\.all\(\)')
+
+# 將非空查詢的 .all() 結果賦值給變數（FastAPI 分頁替換用）
+_QUERY_ALL_ASSIGN_RE = re.compile(r'(\w+)\s*=\s*(.+?)\.all\(\)')
+
+# 循環中的 await 呼叫
+_LOOP_AWAIT_RE = re.compile(r'for\s+\w+\s+in\s+(.*?):\s*.*?await', re.DOTALL)
+
+# async 函數定義的參數列表（群組 2 為參數）
+_ASYNC_DEF_PARAMS_RE = re.compile(r'(async\s+def\s+\w+\s*\()([^)]*?)(\):)')
+
+# 自動添加的分頁參數
+_PAGINATION_PARAMS_RE = re.compile(r'(skip: int = 0, limit: int = 100)')
+
+
+def _loop_block_hits(content: str, pattern: 're.Pattern[str]', in_async_def: bool = False) -> Set[str]:
+    """
+    以逐行方式檢查原始碼中 for 循環主體出現了哪些查詢（無法解析語法樹時的後備）
+    
+    先找出 for 循環標頭行，再只檢查其後縮排較深的有限行數，
+    避免跨行的非貪婪比對在大型文件上反覆回溯。
+    
+    Args:
+        content: 文件內容
+        pattern: 由 _loop_query_pattern 建立的探測正則
+        in_async_def: 是否只檢查第一個 async 函數定義之後的循環
+        
+    Returns:
+        命中的探測名稱集合
+    """
+    start = 0
+    if in_async_def:
+        match = _ASYNC_DEF_KEYWORD_RE.search(content)
+        if match is None:
+            return set()
+        start = match.end()
+    
+    hits = set()
+    for header in _FOR_LINE_RE.finditer(content, start):
+        indent = len(header.group(1))
+        block = [header.group(2)]
+        pos = header.end() + 1
+        for _ in range(_LOOP_BODY_MAX_LINES):
+            if pos >= len(content):
+                break
+            end = content.find('\n', pos)
+            if end == -1:
+                end = len(content)
+            line = content[pos:end]
+            code = line.lstrip(' \t')
+            # 遇到縮排不深於標頭的非空行即表示循環主體結束
+            if code and len(line) - len(code) <= indent:
+                break
+            block.append(line)
+            pos = end + 1
+        
+        match = pattern.match('\n'.join(block))
+        hits.update(name for name, value in match.groupdict().items() if value is not None)
+    return hits
+
+
+def _root_name(node: ast.AST) -> Optional[str]:
+    """
+    取得屬性或呼叫鏈最左端的名稱，例如 db.session.add(x) 的 'db'
+    
+    Args:
+        node: 表達式節點
+        
+    Returns:
+        名稱，鏈的起點不是名稱時返回 None
+    """
+    while isinstance(node, (ast.Attribute, ast.Call)):
+        node = node.value if isinstance(node, ast.Attribute) else node.func
+    return node.id if isinstance(node, ast.Name) else None
+
+
+def _is_attribute(node: ast.AST, attr: str) -> bool:
+    """檢查節點是否為指定名稱的屬性存取（如 .objects）"""
+    return isinstance(node, ast.Attribute) and node.attr == attr
+
+
+def _is_method_call(node: ast.AST, attr: str) -> bool:
+    """檢查節點是否為指定名稱的方法呼叫（如 .get(...)）"""
+    return isinstance(node, ast.Call) and _is_attribute(node.func, attr)
+
+
+def _is_session_call(node: ast.AST, attr: str) -> bool:
+    """檢查節點是否為 session 上的方法呼叫（如 session.add(...) 或 db.session.add(...)）"""
+    if not _is_method_call(node, attr):
+        return False
+    receiver = node.func.value
+    return (isinstance(receiver, ast.Name) and receiver.id == 'session') or _is_attribute(receiver, 'session')
+
+
+def _is_await_of(node: ast.AST, match: Callable[[ast.AST], bool]) -> bool:
+    """檢查節點是否為 await 表達式，且被等待的表達式中有符合條件的節點"""
+    return isinstance(node, ast.Await) and any(match(sub) for sub in ast.walk(node.value))
+
+
+def _loop_body_nodes(tree: ast.AST, in_async_def: bool = False) -> List[ast.AST]:
+    """
+    收集語法樹中所有 for 循環主體內的節點（不含被迭代的表達式）
+    
+    巢狀循環與巢狀 async 函數中的節點只收集一次，各組探測共用這份
+    攤平的節點列表，無需各自重新走訪語法樹。
+    
+    Args:
+        tree: 語法樹
+        in_async_def: 是否只收集 async 函數中的循環
+        
+    Returns:
+        循環主體內的節點列表
+    """
+    roots = [node for node in ast.walk(tree) if isinstance(node, ast.AsyncFunctionDef)] if in_async_def else [tree]
+    seen_loops = set()
+    nodes = {}
+    for root in roots:
+        for loop in ast.walk(root):
+            if not isinstance(loop, (ast.For, ast.AsyncFor)) or id(loop) in seen_loops:
+                continue
+            seen_loops.add(id(loop))
+            for statement in loop.body:
+                for node in ast.walk(statement):
+                    nodes.setdefault(id(node), node)
+    return list(nodes.values())
+
+
+def _find_loop_probes(nodes: List[ast.AST], probes: Dict[str, Callable[[ast.AST], bool]]) -> Set[str]:
+    """
+    檢查哪些探測在循環主體中出現
+    
+    Args:
+        nodes: 由 _loop_body_nodes 收集的循環主體節點
+        probes: 探測名稱到節點判斷函數的對應
+        
+    Returns:
+        命中的探測名稱集合
+    """
+    hits = set()
+    pending = dict(probes)
+    for node in nodes:
+        for name, probe in list(pending.items()):
+            if probe(node):
+                hits.add(name)
+                del pending[name]
+        if not pending:
+            break
+    return hits
+
+
+# 以語法樹檢測循環中查詢時，各探測對應的節點判斷（名稱與上方正則的群組名稱相同）
+_DJANGO_N_PLUS_ONE_PROBES = {
+    'objects': lambda node: _is_attribute(node, 'objects'),
+    'filter': lambda node: _is_attribute(node, 'filter'),
+    'get': lambda node: _is_method_call(node, 'get')
+}
+_FLASK_N_PLUS_ONE_PROBES = {
+    'query': lambda node: _is_attribute(node, 'query'),
+    'session_query': lambda node: _is_session_call(node, 'query'),
+    'get': lambda node: _is_method_call(node, 'get')
+}
+_FASTAPI_N_PLUS_ONE_PROBES = {
+    'get': lambda node: _is_await_of(node, lambda sub: _is_method_call(sub, 'get')),
+    'db': lambda node: isinstance(node, ast.Await) and _root_name(node.value) == 'db'
+}
+_DJANGO_BULK_PROBES = {
+    'create': lambda node: _is_method_call(node, 'create') and _is_attribute(node.func.value, 'objects'),
+    'save': lambda node: _is_method_call(node, 'save')
+}
+_SQLALCHEMY_BULK_PROBES = {
+    'add': lambda node: _is_session_call(node, 'add'),
+    'flush': lambda node: _is_session_call(node, 'flush'),
+    'commit': lambda node: _is_session_call(node, 'commit')
+}
+
+
+def _find_all(content: str, needle: str) -> List[int]:
+    """
+    找出子字串在內容中所有出現的位置
+    
+    Args:
+        content: 文件內容
+        needle: 要尋找的子字串
+        
+    Returns:
+        遞增排列的起始位置列表
+    """
+    offsets = []
+    index = content.find(needle)
+    while index >= 0:
+        offsets.append(index)
+        index = content.find(needle, index + 1)
+    return offsets
+
+
+def _has_uncached_property(content: str) -> bool:
+    """
+    檢查是否有 @property 計算屬性之後不再出現 cached 字樣
+    
+    只要最後一個計算屬性之後沒有 cached 即成立，因此只需從最後一個定義
+    往後搜尋一次，而非對每個定義都掃描到文件結尾。
+    
+    Args:
+        content: 文件內容
+        
+    Returns:
+        如果存在未緩存的計算屬性則返回 True
+    """
+    last_end = None
+    for match in _PROPERTY_DEF_RE.finditer(content):
+        last_end = match.end()
+    return last_end is not None and _CACHED_WORD_RE.search(content, last_end) is None
+
+
+def _node_span(content: str, node: ast.AST) -> Tuple[int, int]:
+    """
+    將語法樹節點的行列位置轉換為內容中的字元位置
+    
+    語法樹的欄位位置以 UTF-8 位元組計算，非 ASCII 行需轉換為字元數。
+    
+    Args:
+        content: 文件內容（換行符號已統一為 \\n）
+        node: 帶有位置資訊的節點
+        
+    Returns:
+        (起始, 結束) 字元位置
+    """
+    def offset(lineno: int, col: int) -> int:
+        line_start = 0
+        for _ in range(lineno - 1):
+            line_start = content.index('\n', line_start) + 1
+        line = content[line_start:line_start + col]
+        if not line.isascii():
+            line_end = content.find('\n', line_start)
+            line = content[line_start:len(content) if line_end == -1 else line_end]
+            line = line.encode('utf-8')[:col].decode('utf-8', 'replace')
+        return line_start + len(line)
+    
+    return offset(node.lineno, node.col_offset), offset(node.end_lineno, node.end_col_offset)
+
+
+def _find_function_by_indent(content: str, function_name: str) -> Optional[Tuple[int, int]]:
+    """
+    以縮排判斷函數範圍（文件無法解析語法樹時的後備）
+    
+    函數主體延續到下一個縮排不深於定義行的非空行之前。
+    
+    Args:
+        content: 文件內容
+        function_name: 函數名稱
+        
+    Returns:
+        (起始, 結束) 字元位置，結束於主體最後一個非空行的行尾；找不到函數時返回 None
+    """
+    function_match = next(
+        (match for match in _FUNCTION_DEF_RE.finditer(content) if match.group(1) == function_name),
+        None
+    )
+    if function_match is None:
+        return None
+    
+    function_start = function_match.start()
+    line_start = content.rfind('\n', 0, function_start) + 1
+    prefix = content[line_start:function_start]
+    indentation = len(prefix) if not prefix.strip() else 0
+    
+    # 參數列表可能跨行，主體從定義結尾的冒號之後開始
+    function_end = content.index(')', function_match.end()) + 2
+    pos = function_end
+    while pos < len(content):
+        line_end = content.find('\n', pos)
+        if line_end == -1:
+            line_end = len(content)
+        line = content[pos:line_end]
+        code = line.lstrip(' \t')
+        if code:
+            if pos > function_end and len(line) - len(code) <= indentation:
+                break
+            function_end = line_end
+        pos = line_end + 1
+    return function_start, function_end
+
+
+def _copy_analysis(analysis_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    複製性能分析結果，包含其中的問題列表與各個問題字典
+    
+    Args:
+        analysis_result: 快取的分析結果
+        
+    Returns:
+        可由呼叫端自由修改的副本
+    """
+    return {
+        key: [dict(item) for item in value] if isinstance(value, list) else value
+        for key, value in analysis_result.items()
+    }
 
 
 class APIPerformanceOptimizer:
@@ -23,6 +458,14 @@ class APIPerformanceOptimizer:
         """
         self.project_path = project_path
         self.framework = framework
+        self._py_files: Optional[List[str]] = None
+        self._sqlalchemy_files: Optional[List[str]] = None
+        self._content_cache: Dict[str, str] = {}
+        self._ast_cache: Dict[str, Optional[ast.Module]] = {}
+        self._loop_nodes_cache: Dict[Tuple[str, bool], List[ast.AST]] = {}
+        self._seen_issues: Set[Tuple[Any, ...]] = set()
+        self._analysis_cache: Optional[Tuple[Tuple[Tuple[str, int, int], ...], Dict[str, Any]]] = None
+        self._endpoint_tree: Optional[Tuple[Tuple[str, int, int], Optional[ast.Module]]] = None
         
         # 如果未指定框架，則檢測框架
         if not self.framework:
@@ -30,10 +473,209 @@ class APIPerformanceOptimizer:
             endpoint_analyzer = EndpointAnalyzer(self.project_path)
             self.framework = endpoint_analyzer.detect_framework()
     
+    def _iter_py_files(self) -> Iterator[str]:
+        """
+        以 os.scandir 遍歷專案，逐一產生 Python 文件路徑
+        
+        遍歷順序與 os.walk 相同；完整遍歷一次後結果快取於實例上，
+        各檢測方法共用同一次遍歷。
+        
+        Yields:
+            Python 文件路徑
+        """
+        if self._py_files is not None:
+            yield from self._py_files
+            return
+        
+        py_files = []
+        stack = [self.project_path]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            
+            sub_dirs = []
+            for entry in entries:
+                if entry.is_dir():
+                    # 與 os.walk 相同，不進入符號連結的目錄
+                    if not entry.is_symlink():
+                        sub_dirs.append(entry.path)
+                elif entry.name.endswith('.py'):
+                    py_files.append(entry.path)
+                    yield entry.path
+            
+            # 反向壓入堆疊，保持與 os.walk 相同的遍歷順序
+            stack.extend(reversed(sub_dirs))
+        
+        self._py_files = py_files
+    
+    def _get_sqlalchemy_files(self) -> List[str]:
+        """
+        取得使用 SQLAlchemy 的 Python 文件，同一次分析中每個文件只判斷一次
+        
+        Returns:
+            使用 SQLAlchemy 的文件路徑列表，順序與遍歷順序相同
+        """
+        if self._sqlalchemy_files is None:
+            self._sqlalchemy_files = [
+                file_path for file_path in self._iter_py_files()
+                if _SQLALCHEMY_PROBE.search(self._read_content(file_path))
+            ]
+        return self._sqlalchemy_files
+    
+    def _read_content(self, file_path: str) -> str:
+        """
+        讀取文件內容，同一次分析中每個文件只讀取一次（大型文件除外）
+        
+        Args:
+            file_path: 文件路徑
+            
+        Returns:
+            文件內容
+        """
+        content = self._content_cache.get(file_path)
+        if content is None:
+            content = read_file(file_path)
+            # 大型文件不常駐記憶體，之後的檢測重新讀取（通常仍在作業系統的頁面快取中）
+            if len(content) <= _LARGE_FILE_CHARS:
+                self._content_cache[file_path] = content
+        return content
+    
+    def _get_tree(self, file_path: str) -> Optional[ast.Module]:
+        """
+        解析文件為語法樹，同一次分析中每個文件只解析一次
+        
+        Args:
+            file_path: 文件路徑
+            
+        Returns:
+            語法樹，若文件無法解析則返回 None
+        """
+        if file_path in self._ast_cache:
+            return self._ast_cache[file_path]
+        
+        try:
+            tree = ast.parse(self._read_content(file_path), filename=file_path)
+        except (SyntaxError, ValueError):
+            tree = None
+        
+        self._ast_cache[file_path] = tree
+        return tree
+    
+    def _loop_query_hits(self, file_path: str, pattern: 're.Pattern[str]',
+                         probes: Dict[str, Callable[[ast.AST], bool]],
+                         in_async_def: bool = False) -> Set[str]:
+        """
+        檢查文件的 for 循環主體中出現了哪些查詢或寫入操作
+        
+        以語法樹檢查循環主體，同一文件的循環主體節點只收集一次，供 N+1 與
+        批量操作檢測共用；文件無法解析時退回以正則比對原始碼。
+        
+        Args:
+            file_path: 文件路徑
+            pattern: 由 _loop_query_pattern 建立的後備探測正則
+            probes: 探測名稱到節點判斷函數的對應
+            in_async_def: 是否只檢查 async 函數中的循環
+            
+        Returns:
+            命中的探測名稱集合
+        """
+        tree = self._get_tree(file_path)
+        if tree is not None:
+            key = (file_path, in_async_def)
+            nodes = self._loop_nodes_cache.get(key)
+            if nodes is None:
+                nodes = _loop_body_nodes(tree, in_async_def)
+                self._loop_nodes_cache[key] = nodes
+            return _find_loop_probes(nodes, probes)
+        
+        return _loop_block_hits(self._read_content(file_path), pattern, in_async_def)
+    
+    def _add_loop_query_issues(self, analysis_result: Dict[str, Any], file_path: str,
+                               pattern: 're.Pattern[str]', probes: Dict[str, Callable[[ast.AST], bool]],
+                               checks: Tuple[Tuple[str, str], ...], in_async_def: bool = False) -> None:
+        """
+        依對照表將循環中命中的探測回報為對應規則的資料庫問題
+        
+        Args:
+            analysis_result: 分析結果字典
+            file_path: 文件路徑
+            pattern: 由 _loop_query_pattern 建立的後備探測正則
+            probes: 探測名稱到節點判斷函數的對應
+            checks: （探測名稱, 規則名稱）對照表，依回報順序排列
+            in_async_def: 是否只檢查 async 函數中的循環
+        """
+        hits = self._loop_query_hits(file_path, pattern, probes, in_async_def)
+        for name, rule_name in checks:
+            if name in hits:
+                self._add_issue(analysis_result['database_issues'], rule_name, file_path)
+    
+    def invalidate(self) -> None:
+        """清除快取的分析結果，下次生成建議時重新分析"""
+        self._analysis_cache = None
+    
+    def _rescan(self) -> None:
+        """捨棄上次遍歷的文件列表，下次使用時重新遍歷專案以反映文件的新增、刪除或修改"""
+        self._py_files = None
+        self._sqlalchemy_files = None
+    
+    def _fingerprint(self) -> Tuple[Tuple[str, int, int], ...]:
+        """
+        計算專案指紋（Python 文件的路徑、修改時間和大小）
+        
+        Returns:
+            專案指紋，文件新增、刪除或修改後即不相同
+        """
+        fingerprint = []
+        for file_path in self._iter_py_files():
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            fingerprint.append((file_path, stat.st_mtime_ns, stat.st_size))
+        return tuple(fingerprint)
+    
     def analyze_api_performance(self) -> Dict[str, Any]:
         """
         分析 API 性能
         
+        每次呼叫都重新分析；結果連同專案指紋快取於實例上，
+        專案未變更時 generate_optimization_recommendations 直接使用。
+        返回的是快取結果的副本，呼叫端修改返回值不會影響快取。
+        
+        Returns:
+            性能分析結果
+        """
+        self._rescan()
+        analysis_result = self._analyze()
+        # 指紋只用於之後判斷快取是否有效，分析完成後才計算（重用分析時的遍歷結果）
+        self._analysis_cache = (self._fingerprint(), analysis_result)
+        return _copy_analysis(analysis_result)
+    
+    def _get_analysis(self) -> Dict[str, Any]:
+        """
+        取得性能分析結果，專案自上次分析後未變更時重用快取的結果
+        
+        返回的結果可能是快取本身，只供內部讀取。
+        
+        Returns:
+            性能分析結果
+        """
+        self._rescan()
+        fingerprint = self._fingerprint()
+        if self._analysis_cache is not None and self._analysis_cache[0] == fingerprint:
+            return self._analysis_cache[1]
+        analysis_result = self._analyze()
+        self._analysis_cache = (fingerprint, analysis_result)
+        return analysis_result
+    
+    def _analyze(self) -> Dict[str, Any]:
+        """
+        執行性能分析
+        
         Returns:
             性能分析結果
         """
@@ -47,17 +689,97 @@ class APIPerformanceOptimizer:
         }
         
         # 分析常見的性能問題
-        self._analyze_n_plus_one_queries(analysis_result)
-        self._analyze_bulk_operations(analysis_result)
-        self._analyze_serialization(analysis_result)
-        self._analyze_pagination(analysis_result)
-        self._analyze_response_size(analysis_result)
+        try:
+            for step_result in self._collect_step_results():
+                analysis_result['issues'].extend(step_result['issues'])
+                analysis_result['database_issues'].extend(step_result['database_issues'])
+        finally:
+            # 文件內容與語法樹只在單次分析中共用，分析結束即釋放，下次分析重新讀取
+            self._content_cache.clear()
+            self._ast_cache.clear()
+            self._loop_nodes_cache.clear()
         
         # 計算總體性能分數
         analysis_result['overall_score'] = self._calculate_performance_score(analysis_result)
         
         return analysis_result
     
+    def _run_analysis_steps(self) -> List[Dict[str, List[Dict[str, Any]]]]:
+        """
+        依序執行各項性能檢測，每項檢測的問題分開收集
+        
+        Returns:
+            每項檢測一個含 'issues' 與 'database_issues' 的字典，順序與檢測順序相同
+        """
+        steps = (
+            self._analyze_n_plus_one_queries,
+            self._analyze_bulk_operations,
+            self._analyze_serialization,
+            self._analyze_pagination,
+            self._analyze_response_size
+        )
+        
+        self._seen_issues.clear()
+        step_results = []
+        for step in steps:
+            step_result = {'issues': [], 'database_issues': []}
+            step(step_result)
+            step_results.append(step_result)
+        return step_results
+    
+    def _add_issue(self, bucket: List[Dict[str, Any]], rule_name: str, file_path: str, **fields: Any) -> None:
+        """
+        依檢測規則添加問題，同一文件的同類問題只回報一次
+        
+        同一文件中多個探測命中同一類問題（例如循環中同時出現 .objects 與
+        .filter）時只保留第一筆，避免重複的修正建議；說明帶有欄位的問題
+        （例如個別端點或分頁大小）描述的是不同位置，以欄位區分各自回報。
+        
+        Args:
+            bucket: 問題要加入的列表
+            rule_name: RULES 中的規則名稱
+            file_path: 發現問題的文件路徑
+            fields: 填入說明模板的欄位
+        """
+        rule = RULES[rule_name]
+        key = (file_path, rule.type, tuple(sorted(fields.items())))
+        if key in self._seen_issues:
+            return
+        self._seen_issues.add(key)
+        bucket.append(rule.as_issue(file_path, **fields))
+    
+    def _collect_step_results(self) -> List[Dict[str, List[Dict[str, Any]]]]:
+        """
+        執行各項性能檢測；文件數量多時按文件分塊分派到多個行程並行檢測
+        
+        Returns:
+            每項檢測的問題，與單行程執行的內容和順序相同
+        """
+        file_paths = list(self._iter_py_files())
+        if len(file_paths) < _PARALLEL_MIN_FILES:
+            return self._run_analysis_steps()
+        
+        tasks = [
+            (self.project_path, self.framework, file_paths[start:start + _PARALLEL_CHUNK_SIZE])
+            for start in range(0, len(file_paths), _PARALLEL_CHUNK_SIZE)
+        ]
+        try:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                chunk_results = list(executor.map(_scan_files, tasks))
+        except (OSError, BrokenProcessPool):
+            # 無法建立工作行程時退回單行程檢測
+            return self._run_analysis_steps()
+        
+        # 先按檢測、再按文件塊的順序合併，保持與遍歷順序一致
+        step_results = []
+        for step_index in range(len(chunk_results[0])):
+            step_result = {'issues': [], 'database_issues': []}
+            for chunk_result in chunk_results:
+                step_result['issues'].extend(chunk_result[step_index]['issues'])
+                step_result['database_issues'].extend(chunk_result[step_index]['database_issues'])
+            step_results.append(step_result)
+        return step_results
+    
     def _analyze_n_plus_one_queries(self, analysis_result: Dict[str, Any]) -> None:
         """
         分析 N+1 查詢問題
@@ -81,40 +803,22 @@ class APIPerformanceOptimizer:
             analysis_result: 分析結果字典
         """
         # 搜索視圖文件
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                if file.endswith('.py') and ('view' in file.lower() or 'viewset' in file.lower()):
-                    file_path = os.path.join(root, file)
-                    content = read_file(file_path)
-                    
-                    # 檢查是否有循環中進行查詢的模式
-                    loop_query_patterns = [
-                        (r'for\s+\w+\s+in\s+.*?:\s*.*?\.objects', 'for 循環中使用 .objects 查詢'),
-                        (r'for\s+\w+\s+in\s+.*?:\s*.*?\.filter', 'for 循環中使用 .filter 查詢'),
-                        (r'for\s+\w+\s+in\s+.*?:\s*.*?\.get\(', 'for 循環中使用 .get() 查詢')
-                    ]
-                    
-                    for pattern, description in loop_query_patterns:
-                        matches = re.findall(pattern, content, re.DOTALL)
-                        if matches:
-                            analysis_result['database_issues'].append({
-                                'type': 'n_plus_one',
-                                'file': file_path,
-                                'description': description,
-                                'solution': '使用 select_related 或 prefetch_related 提前獲取關聯數據',
-                                'severity': 'high'
-                            })
-                    
-                    # 檢查是否缺少 select_related 或 prefetch_related
-                    if 'ForeignKey' in content or 'ManyToManyField' in content:
-                        if 'objects.all()' in content and not ('select_related' in content or 'prefetch_related' in content):
-                            analysis_result['database_issues'].append({
-                                'type': 'missing_related_prefetch',
-                                'file': file_path,
-                                'description': '使用 ForeignKey 或 ManyToManyField 但未使用 select_related/prefetch_related',
-                                'solution': '使用 select_related 或 prefetch_related 優化關聯查詢',
-                                'severity': 'medium'
-                            })
+        for file_path in self._iter_py_files():
+            file_name = os.path.basename(file_path).lower()
+            if not ('view' in file_name or 'viewset' in file_name):
+                continue
+            
+            content = self._read_content(file_path)
+            
+            # 檢查是否有循環中進行查詢的模式
+            self._add_loop_query_issues(
+                analysis_result, file_path, _DJANGO_N_PLUS_ONE_RE, _DJANGO_N_PLUS_ONE_PROBES, _DJANGO_N_PLUS_ONE_CHECKS
+            )
+            
+            # 檢查是否缺少 select_related 或 prefetch_related
+            if 'ForeignKey' in content or 'ManyToManyField' in content:
+                if 'objects.all()' in content and not ('select_related' in content or 'prefetch_related' in content):
+                    self._add_issue(analysis_result['database_issues'], 'missing_related_prefetch', file_path)
     
     def _detect_flask_n_plus_one(self, analysis_result: Dict[str, Any]) -> None:
         """
@@ -123,45 +827,19 @@ class APIPerformanceOptimizer:
         Args:
             analysis_result: 分析結果字典
         """
-        # 搜索視圖文件
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    content = read_file(file_path)
-                    
-                    # 如果不使用 SQLAlchemy，則跳過
-                    if 'sqlalchemy' not in content.lower():
-                        continue
-                    
-                    # 檢查是否有循環中進行查詢的模式
-                    loop_query_patterns = [
-                        (r'for\s+\w+\s+in\s+.*?:\s*.*?\.query', 'for 循環中使用 SQLAlchemy 查詢'),
-                        (r'for\s+\w+\s+in\s+.*?:\s*.*?session\.query', 'for 循環中使用 session.query'),
-                        (r'for\s+\w+\s+in\s+.*?:\s*.*?\.get\(', 'for 循環中使用 .get() 查詢')
-                    ]
-                    
-                    for pattern, description in loop_query_patterns:
-                        matches = re.findall(pattern, content, re.DOTALL)
-                        if matches:
-                            analysis_result['database_issues'].append({
-                                'type': 'n_plus_one',
-                                'file': file_path,
-                                'description': description,
-                                'solution': '使用 joinedload 或 subqueryload 提前獲取關聯數據',
-                                'severity': 'high'
-                            })
-                    
-                    # 檢查是否缺少 joinedload
-                    if 'relationship' in content:
-                        if ('query(' in content or 'query.' in content) and 'joinedload' not in content and 'subqueryload' not in content:
-                            analysis_result['database_issues'].append({
-                                'type': 'missing_joined_load',
-                                'file': file_path,
-                                'description': '使用關聯關係但未使用 joinedload 或 subqueryload',
-                                'solution': '使用 joinedload 或 subqueryload 優化關聯查詢',
-                                'severity': 'medium'
-                            })
+        # 搜索使用 SQLAlchemy 的文件
+        for file_path in self._get_sqlalchemy_files():
+            content = self._read_content(file_path)
+            
+            # 檢查是否有循環中進行查詢的模式
+            self._add_loop_query_issues(
+                analysis_result, file_path, _FLASK_N_PLUS_ONE_RE, _FLASK_N_PLUS_ONE_PROBES, _FLASK_N_PLUS_ONE_CHECKS
+            )
+            
+            # 檢查是否缺少 joinedload
+            if 'relationship' in content:
+                if ('query(' in content or 'query.' in content) and 'joinedload' not in content and 'subqueryload' not in content:
+                    self._add_issue(analysis_result['database_issues'], 'missing_joined_load', file_path)
     
     def _detect_fastapi_n_plus_one(self, analysis_result: Dict[str, Any]) -> None:
         """
@@ -170,33 +848,13 @@ class APIPerformanceOptimizer:
         Args:
             analysis_result: 分析結果字典
         """
-        # FastAPI 通常使用 SQLAlchemy，所以檢測方法類似 Flask
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    content = read_file(file_path)
-                    
-                    # 如果不使用 SQLAlchemy，則跳過
-                    if 'sqlalchemy' not in content.lower():
-                        continue
-                    
-                    # 檢查 async 函數中的循環查詢
-                    loop_query_patterns = [
-                        (r'async\s+def.*?for\s+\w+\s+in\s+.*?:\s*.*?await\s+.*?\.get\(', 'async 函數的 for 循環中使用 await .get()'),
-                        (r'async\s+def.*?for\s+\w+\s+in\s+.*?:\s*.*?await\s+db\.', 'async 函數的 for 循環中使用數據庫查詢')
-                    ]
-                    
-                    for pattern, description in loop_query_patterns:
-                        matches = re.findall(pattern, content, re.DOTALL)
-                        if matches:
-                            analysis_result['database_issues'].append({
-                                'type': 'async_n_plus_one',
-                                'file': file_path,
-                                'description': description,
-                                'solution': '使用 selectinload 或批次查詢優化異步查詢',
-                                'severity': 'high'
-                            })
+        # FastAPI 通常使用 SQLAlchemy，所以檢測方法類似 Flask（只檢查使用 SQLAlchemy 的文件）
+        for file_path in self._get_sqlalchemy_files():
+            # 檢查 async 函數中的循環查詢
+            self._add_loop_query_issues(
+                analysis_result, file_path, _FASTAPI_N_PLUS_ONE_RE, _FASTAPI_N_PLUS_ONE_PROBES,
+                _FASTAPI_N_PLUS_ONE_CHECKS, in_async_def=True
+            )
     
     def _analyze_bulk_operations(self, analysis_result: Dict[str, Any]) -> None:
         """
@@ -218,53 +876,11 @@ class APIPerformanceOptimizer:
         Args:
             analysis_result: 分析結果字典
         """
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    content = read_file(file_path)
-                    
-                    # 檢查循環中的個別創建或更新
-                    multiple_create_pattern = r'for\s+\w+\s+in\s+.*?:\s*.*?\.objects\.create\('
-                    individual_save_pattern = r'for\s+\w+\s+in\s+.*?:\s*.*?\.save\('
-                    
-                    if re.search(multiple_create_pattern, content, re.DOTALL):
-                        analysis_result['database_issues'].append({
-                            'type': 'individual_creates',
-                            'file': file_path,
-                            'description': '循環中使用個別的 .objects.create() 而非批量操作',
-                            'solution': '使用 bulk_create() 代替循環中的單獨創建',
-                            'severity': 'medium',
-                            'code_example': '''
-# 優化前:
-for item in items:
-    Model.objects.create(field1=item.value1, field2=item.value2)
-
-# 優化後:
-objects_to_create = [Model(field1=item.value1, field2=item.value2) for item in items]
-Model.objects.bulk_create(objects_to_create)
-'''
-                        })
-                    
-                    if re.search(individual_save_pattern, content, re.DOTALL):
-                        analysis_result['database_issues'].append({
-                            'type': 'individual_saves',
-                            'file': file_path,
-                            'description': '循環中使用個別的 .save() 而非批量操作',
-                            'solution': '使用 bulk_update() 代替循環中的單獨更新',
-                            'severity': 'medium',
-                            'code_example': '''
-# 優化前:
-for obj in objects:
-    obj.field = new_value
-    obj.save()
-
-# 優化後:
-for obj in objects:
-    obj.field = new_value
-Model.objects.bulk_update(objects, ['field'])
-'''
-                        })
+        for file_path in self._iter_py_files():
+            # 檢查循環中的個別創建或更新
+            self._add_loop_query_issues(
+                analysis_result, file_path, _DJANGO_BULK_RE, _DJANGO_BULK_PROBES, _DJANGO_BULK_CHECKS
+            )
     
     def _detect_sqlalchemy_bulk_opportunities(self, analysis_result: Dict[str, Any]) -> None:
         """
@@ -273,63 +889,12 @@ Model.objects.bulk_update(objects, ['field'])
         Args:
             analysis_result: 分析結果字典
         """
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    content = read_file(file_path)
-                    
-                    # 如果不使用 SQLAlchemy，則跳過
-                    if 'sqlalchemy' not in content.lower():
-                        continue
-                    
-                    # 檢查循環中的個別添加或提交
-                    individual_add_pattern = r'for\s+\w+\s+in\s+.*?:\s*.*?session\.add\('
-                    multiple_flush_pattern = r'for\s+\w+\s+in\s+.*?:\s*.*?session\.flush\('
-                    multiple_commit_pattern = r'for\s+\w+\s+in\s+.*?:\s*.*?session\.commit\('
-                    
-                    if re.search(individual_add_pattern, content, re.DOTALL):
-                        analysis_result['database_issues'].append({
-                            'type': 'individual_adds',
-                            'file': file_path,
-                            'description': '循環中使用個別的 session.add() 操作',
-                            'solution': '在循環外執行一次 session.add_all() 和 session.commit()',
-                            'severity': 'medium',
-                            'code_example': '''
-# 優化前:
-for item in items:
-    new_obj = Model(field1=item.value1, field2=item.value2)
-    session.add(new_obj)
-    session.commit()
-
-# 優化後:
-objects_to_add = [Model(field1=item.value1, field2=item.value2) for item in items]
-session.add_all(objects_to_add)
-session.commit()
-'''
-                        })
-                    
-                    if re.search(multiple_flush_pattern, content, re.DOTALL) or re.search(multiple_commit_pattern, content, re.DOTALL):
-                        analysis_result['database_issues'].append({
-                            'type': 'multiple_commits',
-                            'file': file_path,
-                            'description': '循環中執行多次 flush/commit 操作',
-                            'solution': '在循環外批量執行一次 commit',
-                            'severity': 'high',
-                            'code_example': '''
-# 優化前:
-for item in items:
-    new_obj = Model(field1=item.value1, field2=item.value2)
-    session.add(new_obj)
-    session.commit()  # 每次迭代都提交事務
-
-# 優化後:
-for item in items:
-    new_obj = Model(field1=item.value1, field2=item.value2)
-    session.add(new_obj)
-session.commit()  # 循環結束後執行一次提交
-'''
-                        })
+        # 只檢查使用 SQLAlchemy 的文件
+        for file_path in self._get_sqlalchemy_files():
+            # 檢查循環中的個別添加或提交
+            self._add_loop_query_issues(
+                analysis_result, file_path, _SQLALCHEMY_BULK_RE, _SQLALCHEMY_BULK_PROBES, _SQLALCHEMY_BULK_CHECKS
+            )
     
     def _analyze_serialization(self, analysis_result: Dict[str, Any]) -> None:
         """
@@ -353,68 +918,26 @@ session.commit()  # 循環結束後執行一次提交
             analysis_result: 分析結果字典
         """
         # 尋找序列化器文件
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                if file.endswith('.py') and ('serializer' in file.lower() or 'viewset' in file.lower()):
-                    file_path = os.path.join(root, file)
-                    content = read_file(file_path)
-                    
-                    # 檢查是否使用 DRF 序列化器
-                    if 'rest_framework' in content and 'Serializer' in content:
-                        # 檢查 depth 參數使用
-                        if 'depth = ' in content:
-                            analysis_result['issues'].append({
-                                'type': 'serializer_depth',
-                                'file': file_path,
-                                'description': '使用序列化器的 depth 參數可能導致過度序列化',
-                                'solution': '考慮使用嵌套序列化器並明確指定要包含的欄位，而非使用通用 depth',
-                                'severity': 'medium'
-                            })
-                        
-                        # 檢查是否使用了 SerializerMethodField 但沒有緩存結果
-                        if 'SerializerMethodField' in content and '@cached_property' not in content:
-                            analysis_result['issues'].append({
-                                'type': 'uncached_method_field',
-                                'file': file_path,
-                                'description': '使用 SerializerMethodField 但沒有緩存計算結果',
-                                'solution': '考慮使用 @cached_property 裝飾器緩存 get_* 方法的結果',
-                                'severity': 'low',
-                                'code_example': '''
-# 優化前:
-def get_calculated_field(self, obj):
-    # 執行複雜計算
-    return complex_calculation(obj)
-
-# 優化後:
-@cached_property
-def get_calculated_field(self, obj):
-    # 執行複雜計算
-    return complex_calculation(obj)
-'''
-                            })
-                        
-                        # 檢查是否有不必要的序列化欄位
-                        if 'fields = ' in content and "'__all__'" in content:
-                            analysis_result['issues'].append({
-                                'type': 'excessive_serialization',
-                                'file': file_path,
-                                'description': '使用 fields = "__all__" 可能導致過度序列化，包含不必要的欄位',
-                                'solution': '明確指定僅需要的欄位列表，而非使用 "__all__"',
-                                'severity': 'medium',
-                                'code_example': '''
-# 優化前:
-class UserSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = User
-        fields = '__all__'
-
-# 優化後:
-class UserSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = User
-        fields = ['id', 'username', 'email', 'profile']  # 只包含必要欄位
-'''
-                            })
+        for file_path in self._iter_py_files():
+            file_name = os.path.basename(file_path).lower()
+            if not ('serializer' in file_name or 'viewset' in file_name):
+                continue
+            
+            content = self._read_content(file_path)
+            
+            # 檢查是否使用 DRF 序列化器
+            if 'rest_framework' in content and 'Serializer' in content:
+                # 檢查 depth 參數使用
+                if 'depth = ' in content:
+                    self._add_issue(analysis_result['issues'], 'serializer_depth', file_path)
+                
+                # 檢查是否使用了 SerializerMethodField 但沒有緩存結果
+                if 'SerializerMethodField' in content and '@cached_property' not in content:
+                    self._add_issue(analysis_result['issues'], 'uncached_method_field', file_path)
+                
+                # 檢查是否有不必要的序列化欄位
+                if 'fields = ' in content and "'__all__'" in content:
+                    self._add_issue(analysis_result['issues'], 'excessive_serialization', file_path)
     
     def _detect_fastapi_serialization_issues(self, analysis_result: Dict[str, Any]) -> None:
         """
@@ -424,48 +947,19 @@ class UserSerializer(serializers.ModelSerializer):
             analysis_result: 分析結果字典
         """
         # 尋找 Pydantic 模型文件
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    content = read_file(file_path)
-                    
-                    # 檢查是否使用 Pydantic
-                    if 'pydantic' in content and 'BaseModel' in content:
-                        # 檢查是否有複雜的計算屬性但沒有緩存
-                        property_pattern = r'@property\s+def\s+\w+\s*\([^)]*\):\s*(?!.*?\bcached\b)'
-                        if re.search(property_pattern, content, re.DOTALL):
-                            analysis_result['issues'].append({
-                                'type': 'uncached_property',
-                                'file': file_path,
-                                'description': '使用未緩存的計算屬性可能導致序列化期間重複計算',
-                                'solution': '考慮使用 functools.cached_property 緩存計算結果',
-                                'severity': 'low',
-                                'code_example': '''
-# 優化前:
-@property
-def full_name(self) -> str:
-    return f"{self.first_name} {self.last_name}"
-
-# 優化後:
-from functools import cached_property
-
-@cached_property
-def full_name(self) -> str:
-    return f"{self.first_name} {self.last_name}"
-'''
-                            })
-                        
-                        # 檢查是否使用了過多的嵌套模型
-                        nested_models_count = content.count('BaseModel')
-                        if nested_models_count > 5:
-                            analysis_result['issues'].append({
-                                'type': 'excessive_nested_models',
-                                'file': file_path,
-                                'description': f'檢測到大量嵌套的 Pydantic 模型 ({nested_models_count})，可能導致過度序列化',
-                                'solution': '考慮拆分模型或使用回應模型減少不必要的欄位',
-                                'severity': 'medium'
-                            })
+        for file_path in self._iter_py_files():
+            content = self._read_content(file_path)
+            
+            # 檢查是否使用 Pydantic（BaseModel 的計數同時作為存在檢查）
+            nested_models_count = content.count('BaseModel') if 'pydantic' in content else 0
+            if nested_models_count:
+                # 檢查是否有複雜的計算屬性但沒有緩存
+                if _has_uncached_property(content):
+                    self._add_issue(analysis_result['issues'], 'uncached_property', file_path)
+                
+                # 檢查是否使用了過多的嵌套模型
+                if nested_models_count > 5:
+                    self._add_issue(analysis_result['issues'], 'excessive_nested_models', file_path, count=nested_models_count)
     
     def _analyze_pagination(self, analysis_result: Dict[str, Any]) -> None:
         """
@@ -489,52 +983,23 @@ def full_name(self) -> str:
         Args:
             analysis_result: 分析結果字典
         """
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                if file.endswith('.py') and ('view' in file.lower() or 'viewset' in file.lower()):
-                    file_path = os.path.join(root, file)
-                    content = read_file(file_path)
-                    
-                    # 檢查是否有缺少分頁的 API 視圖
-                    view_pattern = r'class\s+\w+(?:View|ViewSet)\s*\([^)]*\):'
-                    view_matches = re.findall(view_pattern, content)
-                    
-                    # 檢查這些視圖是否缺少分頁
-                    if view_matches and 'ListAPIView' in content and 'pagination_class' not in content and 'paginate_queryset' not in content:
-                        analysis_result['issues'].append({
-                            'type': 'missing_pagination',
-                            'file': file_path,
-                            'description': '列表視圖缺少分頁，可能導致大型資料集的性能問題',
-                            'solution': '添加分頁類以限制回應大小',
-                            'severity': 'high',
-                            'code_example': '''
-# settings.py
-REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 100
-}
-
-# 或在視圖中指定
-class MyListView(ListAPIView):
-    pagination_class = PageNumberPagination
-    page_size = 100
-'''
-                        })
-                    
-                    # 檢查是否有過大的分頁大小
-                    large_page_pattern = r'page_size\s*=\s*(\d+)'
-                    page_size_matches = re.findall(large_page_pattern, content)
-                    
-                    for size_match in page_size_matches:
-                        size = int(size_match)
-                        if size > 1000:
-                            analysis_result['issues'].append({
-                                'type': 'large_page_size',
-                                'file': file_path,
-                                'description': f'過大的分頁大小 ({size})，可能導致資料傳輸和處理延遲',
-                                'solution': '將分頁大小減少到合理範圍（通常為 20-100）',
-                                'severity': 'medium'
-                            })
+        for file_path in self._iter_py_files():
+            file_name = os.path.basename(file_path).lower()
+            if not ('view' in file_name or 'viewset' in file_name):
+                continue
+            
+            content = self._read_content(file_path)
+            
+            # 檢查是否有缺少分頁的 API 視圖（先做子字串檢查，必要時才比對視圖類別）
+            if ('ListAPIView' in content and 'pagination_class' not in content
+                    and 'paginate_queryset' not in content and _DJANGO_VIEW_CLASS_RE.search(content)):
+                self._add_issue(analysis_result['issues'], 'django_missing_pagination', file_path)
+            
+            # 檢查是否有過大的分頁大小
+            for size_match in _PAGE_SIZE_RE.findall(content):
+                size = int(size_match)
+                if size > 1000:
+                    self._add_issue(analysis_result['issues'], 'large_page_size', file_path, size=size)
     
     def _detect_flask_pagination_issues(self, analysis_result: Dict[str, Any]) -> None:
         """
@@ -543,49 +1008,13 @@ class MyListView(ListAPIView):
         Args:
             analysis_result: 分析結果字典
         """
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    content = read_file(file_path)
-                    
-                    # 跳過不處理 SQLAlchemy 的文件
-                    if 'sqlalchemy' not in content.lower():
-                        continue
-                    
-                    # 檢查是否有返回所有結果而不分頁的端點
-                    query_all_pattern = r'\.query\.all\(\)'
-                    route_pattern = r'@(?:app|blueprint)\.route\([\'"][^\'"]*[\'"]\)'
-                    
-                    if re.search(query_all_pattern, content) and re.search(route_pattern, content) and 'limit' not in content:
-                        analysis_result['issues'].append({
-                            'type': 'missing_pagination',
-                            'file': file_path,
-                            'description': '直接返回 .query.all() 結果而沒有分頁',
-                            'solution': '實施分頁以限制回應大小',
-                            'severity': 'high',
-                            'code_example': '''
-# 優化前:
-@app.route('/api/items')
-def get_items():
-    items = Item.query.all()
-    return jsonify([item.to_dict() for item in items])
-
-# 優化後:
-@app.route('/api/items')
-def get_items():
-    page = request.args.get('page', 1, type=int)
-    per_page = min(request.args.get('per_page', 20, type=int), 100)  # 限制最大頁面大小
-    pagination = Item.query.paginate(page=page, per_page=per_page, error_out=False)
-    
-    return jsonify({
-        'items': [item.to_dict() for item in pagination.items],
-        'total': pagination.total,
-        'pages': pagination.pages,
-        'page': page
-    })
-'''
-                        })
+        # 跳過不處理 SQLAlchemy 的文件
+        for file_path in self._get_sqlalchemy_files():
+            content = self._read_content(file_path)
+            
+            # 檢查是否有返回所有結果而不分頁的端點
+            if '.query.all()' in content and _FLASK_ROUTE_RE.search(content) and 'limit' not in content:
+                self._add_issue(analysis_result['issues'], 'flask_missing_pagination', file_path)
     
     def _detect_fastapi_pagination_issues(self, analysis_result: Dict[str, Any]) -> None:
         """
@@ -594,59 +1023,38 @@ def get_items():
         Args:
             analysis_result: 分析結果字典
         """
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    content = read_file(file_path)
-                    
-                    # 檢查是否有 FastAPI 端點定義
-                    if '@app.get' not in content and '@router.get' not in content:
-                        continue
-                    
-                    # 檢查是否有返回所有結果而不分頁的端點
-                    # 檢查有請求參數但沒有分頁參數的端點
-                    endpoint_pattern = r'@(?:app|router)\.get\([\'"][^\'"]*[\'"]\)\s*async\s+def\s+([^\(]+)\('
-                    endpoint_matches = re.findall(endpoint_pattern, content)
+        for file_path in self._iter_py_files():
+            content = self._read_content(file_path)
+            
+            # 檢查是否有 FastAPI 端點定義
+            if '@app.get' not in content and '@router.get' not in content:
+                continue
+            
+            # 一次掃描建立 async 函數定義的索引（同名函數以第一個定義為準），
+            # 以及所有 'async def' 出現的位置，用來界定函數內容
+            signatures = {}
+            for func_match in _ASYNC_DEF_RE.finditer(content):
+                signatures.setdefault(func_match.group(1), func_match)
+            async_def_offsets = _find_all(content, 'async def')
+            
+            # 檢查是否有返回所有結果而不分頁的端點
+            # 檢查有請求參數但沒有分頁參數的端點
+            for endpoint in _FASTAPI_GET_ENDPOINT_RE.findall(content):
+                # 檢查這個端點的函數定義中是否提到 limit 或 skip 參數
+                func_match = signatures.get(endpoint.strip())
+                if func_match is None:
+                    continue
+                
+                signature = func_match.group(0)
+                if 'limit' not in signature and 'skip' not in signature and 'page' not in signature:
+                    # 簡單檢查：函數內容延伸到下一個 'async def' 或文件結尾
+                    next_index = bisect_left(async_def_offsets, func_match.end())
+                    func_end = async_def_offsets[next_index] if next_index < len(async_def_offsets) else len(content)
+                    func_content = content[func_match.start():func_end]
                     
-                    for endpoint in endpoint_matches:
-                        # 檢查這個端點的函數定義中是否提到 limit 或 skip 參數
-                        func_pattern = rf'async\s+def\s+{re.escape(endpoint)}\s*\([^)]*\)'
-                        func_match = re.search(func_pattern, content)
-                        
-                        if func_match and 'limit' not in func_match.group(0) and 'skip' not in func_match.group(0) and 'page' not in func_match.group(0):
-                            # 檢查函數體是否有 .all() 調用
-                            func_index = content.find(func_match.group(0))
-                            if func_index >= 0:
-                                # 簡單檢查：查找下一個函數定義或文件結尾前的內容
-                                next_func = content.find('async def', func_index + len(func_match.group(0)))
-                                func_content = content[func_index : next_func if next_func > 0 else len(content)]
-                                
-                                # 如果使用資料庫操作但沒有分頁
-                                if ('.all()' in func_content or '.filter(' in func_content) and 'limit' not in func_content and 'offset' not in func_content:
-                                    analysis_result['issues'].append({
-                                        'type': 'missing_pagination',
-                                        'file': file_path,
-                                        'description': f'端點 {endpoint} 返回所有結果而沒有分頁',
-                                        'solution': '使用查詢參數實施分頁',
-                                        'severity': 'high',
-                                        'code_example': '''
-# 優化前:
-@app.get("/items/")
-async def read_items():
-    items = db.query(Item).all()
-    return items
-
-# 優化後:
-@app.get("/items/")
-async def read_items(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000)
-):
-    items = db.query(Item).offset(skip).limit(limit).all()
-    return items
-'''
-                                    })
+                    # 如果使用資料庫操作但沒有分頁
+                    if ('.all()' in func_content or '.filter(' in func_content) and 'limit' not in func_content and 'offset' not in func_content:
+                        self._add_issue(analysis_result['issues'], 'fastapi_missing_pagination', file_path, endpoint=endpoint)
     
     def _analyze_response_size(self, analysis_result: Dict[str, Any]) -> None:
         """
@@ -656,55 +1064,40 @@ async def read_items(
             analysis_result: 分析結果字典
         """
         # 查找可能返回大量數據的端點
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    content = read_file(file_path)
-                    
-                    # 檢查是否有端點定義
-                    if '@app' not in content and '@route' not in content and 'def get' not in content:
-                        continue
-                    
-                    # 檢查是否有不加篩選的查詢
-                    unfiltered_queries = [
-                        ('.all()', '使用 .all() 檢索所有記錄'),
-                        ('find({})', '使用空篩選查詢所有文檔'),
-                        ('select()', '使用沒有篩選的 select()')
-                    ]
-                    
-                    for query, description in unfiltered_queries:
-                        if query in content:
-                            # 檢查是否在回應中直接返回
-                            analysis_result['issues'].append({
-                                'type': 'large_response',
-                                'file': file_path,
-                                'description': description + '，可能導致大量數據傳輸',
-                                'solution': '使用分頁、適當的篩選或欄位選擇限制回應大小',
-                                'severity': 'medium'
-                            })
-                    
-                    # 檢查是否有嵌套循環生成回應
-                    nested_list_comp_pattern = r'\[\s*\[\s*.*?\s*for\s+.*?\s+in\s+.*?\s*\]\s*for\s+'
-                    if re.search(nested_list_comp_pattern, content):
-                        analysis_result['issues'].append({
-                            'type': 'nested_response_generation',
-                            'file': file_path,
-                            'description': '使用嵌套列表推導式生成回應，可能導致性能問題',
-                            'solution': '考慮優化資料結構或使用資料庫層面的連接',
-                            'severity': 'medium'
-                        })
-                    
-                    # 檢查是否有大量連接的查詢
-                    if self.framework == 'django':
-                        if 'select_related' in content and content.count('__') > 5:
-                            analysis_result['issues'].append({
-                                'type': 'excessive_joins',
-                                'file': file_path,
-                                'description': '使用過多的級聯關係（__）可能導致複雜的 SQL 連接',
-                                'solution': '減少查詢中的關聯層次或分解為多個查詢',
-                                'severity': 'medium'
-                            })
+        for file_path in self._iter_py_files():
+            content = self._read_content(file_path)
+            
+            # 檢查是否有端點定義
+            if not any(marker in content for marker in _ENDPOINT_MARKERS):
+                continue
+            
+            # 檢查是否有不加篩選的查詢
+            for query, rule_name in _UNFILTERED_QUERIES:
+                if query in content:
+                    # 檢查是否在回應中直接返回
+                    self._add_issue(analysis_result['issues'], rule_name, file_path)
+            
+            # 檢查是否有嵌套循環生成回應
+            if _NESTED_LIST_COMP_RE.search(content):
+                self._add_issue(analysis_result['issues'], 'nested_response_generation', file_path)
+            
+            # 檢查是否有大量連接的查詢
+            if self.framework == 'django':
+                if 'select_related' in content and content.count('__') > 5:
+                    self._add_issue(analysis_result['issues'], 'excessive_joins', file_path)
+    
+    def to_json_bytes(self, result: Dict[str, Any], indent: bool = False) -> bytes:
+        """
+        將分析結果或優化建議序列化為 JSON，供寫入文件或回應使用
+        
+        Args:
+            result: analyze_api_performance 或 generate_optimization_recommendations 的結果
+            indent: 是否以兩個空格縮排輸出
+            
+        Returns:
+            UTF-8 編碼的 JSON，規則的程式碼範例集中在 code_examples 中只輸出一次
+        """
+        return dumps_report_bytes(result, indent)
     
     def _calculate_performance_score(self, analysis_result: Dict[str, Any]) -> int:
         """
@@ -746,8 +1139,8 @@ async def read_items(
         Returns:
             含詳細建議的字典
         """
-        # 首先分析性能問題
-        analysis = self.analyze_api_performance()
+        # 首先分析性能問題（專案未變更時重用上次的分析結果）
+        analysis = self._get_analysis()
         
         # 根據分析結果生成建議
         recommendations = {
@@ -1131,6 +1524,66 @@ class Config:
         
         return titles.get(issue_type, issue_type.replace('_', ' ').title())
     
+    def _get_endpoint_tree(self, file_path: str, content: str) -> Optional[ast.Module]:
+        """
+        解析要優化的文件，與上次解析的是同一文件且未變更時重用語法樹
+        
+        只保留最近一個文件的語法樹，以路徑、修改時間和大小判斷文件是否變更。
+        
+        Args:
+            file_path: 文件路徑
+            content: 目前的文件內容
+            
+        Returns:
+            語法樹，若文件無法解析則返回 None
+        """
+        try:
+            stat = os.stat(file_path)
+            key = (file_path, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            key = None
+        
+        if key is not None and self._endpoint_tree is not None and self._endpoint_tree[0] == key:
+            return self._endpoint_tree[1]
+        
+        try:
+            tree = ast.parse(content, filename=file_path)
+        except (SyntaxError, ValueError):
+            tree = None
+        
+        if key is not None:
+            self._endpoint_tree = (key, tree)
+        return tree
+    
+    def _find_function(self, file_path: str, content: str, function_name: str) -> Optional[Tuple[int, int]]:
+        """
+        找出函數定義在文件內容中的範圍
+        
+        以語法樹定位函數（從 def 或 async 開始，不含裝飾器），同名時取最先出現的定義，
+        範圍結束於函數最後一個語句的結尾；文件無法解析時退回以縮排判斷。
+        
+        Args:
+            file_path: 文件路徑
+            content: 文件內容
+            function_name: 函數名稱
+            
+        Returns:
+            (起始, 結束) 字元位置，找不到函數時返回 None
+        """
+        tree = self._get_endpoint_tree(file_path, content)
+        if tree is None:
+            return _find_function_by_indent(content, function_name)
+        
+        nodes = [
+            node for node in ast.walk(tree)
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == function_name
+        ]
+        if not nodes:
+            return None
+        
+        node = min(nodes, key=lambda node: (node.lineno, node.col_offset))
+        return _node_span(content, node)
+    
     def optimize_endpoint(self, file_path: str, function_name: str) -> Dict[str, Any]:
         """
         優化特定 API 端點
@@ -1142,87 +1595,99 @@ class Config:
         Returns:
             優化結果
         """
-        # 讀取文件
-        content = read_file(file_path)
-        
-        # 尋找函數定義
-        function_pattern = rf'(?:async\s+)?def\s+{re.escape(function_name)}\s*\([^)]*\):'
-        function_match = re.search(function_pattern, content)
-        
-        if not function_match:
-            return {
-                'success': False,
-                'message': f'未找到函數 {function_name}'
-            }
+        return self.optimize_endpoints(file_path, [function_name])['endpoints'][function_name]
+    
+    def optimize_endpoints(self, file_path: str, function_names: List[str]) -> Dict[str, Any]:
+        """
+        批量優化同一文件中的多個 API 端點
         
-        # 獲取函數內容
-        function_start = function_match.start()
+        文件只讀取、解析和寫入一次：先找出所有端點的範圍並分別優化，
+        再由後往前替換，讓前面端點的位置不受替換影響。
         
-        # 尋找函數結束
-        function_end = len(content)
-        indentation = 0
-        lines = content[function_start:].split('\n')
+        Args:
+            file_path: 文件路徑
+            function_names: 端點函數名稱列表
+            
+        Returns:
+            含整體結果與 'endpoints'（各端點的優化結果，以函數名稱索引）的字典
+        """
+        # 讀取文件
+        content = read_file(file_path)
         
-        # 計算函數的縮排
-        first_line = lines[0]
-        for i, char in enumerate(first_line):
-            if char != ' ' and char != '\t':
-                break
-            indentation += 1
-        
-        # 尋找函數結束位置
-        current_pos = function_start
-        for i, line in enumerate(lines[1:], 1):
-            # 跳過空行
-            if not line.strip():
-                current_pos += len(line) + 1  # +1 for newline
+        endpoints = {}
+        edits = []
+        for function_name in dict.fromkeys(function_names):
+            # 尋找函數定義
+            span = self._find_function(file_path, content, function_name)
+            
+            if span is None:
+                endpoints[function_name] = {
+                    'success': False,
+                    'message': f'未找到函數 {function_name}'
+                }
                 continue
             
-            # 檢查縮排
-            line_indent = 0
-            for char in line:
-                if char != ' ' and char != '\t':
-                    break
-                line_indent += 1
+            # 提取函數代碼
+            function_start, function_end = span
+            function_code = content[function_start:function_end]
             
-            # 如果縮排小於或等於函數縮排，函數已結束
-            if line_indent <= indentation and line.strip():
-                function_end = current_pos
-                break
+            # 分析函數代碼的性能問題
+            optimization_result = self._optimize_function_code(function_code, self.framework)
             
-            current_pos += len(line) + 1  # +1 for newline
-        
-        # 提取函數代碼
-        function_code = content[function_start:function_end]
-        
-        # 分析函數代碼的性能問題
-        optimization_result = self._optimize_function_code(function_code, self.framework)
-        
-        if not optimization_result['optimized_code']:
-            return {
-                'success': False,
-                'message': '無法優化函數代碼',
-                'original_code': function_code
-            }
-        
-        # 更新文件
-        new_content = content[:function_start] + optimization_result['optimized_code'] + content[function_end:]
-        write_success = write_file(file_path, new_content)
-        
-        if not write_success:
-            return {
-                'success': False,
-                'message': '無法寫入優化後的代碼到文件',
+            if not optimization_result['optimized_code']:
+                endpoints[function_name] = {
+                    'success': False,
+                    'message': '無法優化函數代碼',
+                    'original_code': function_code
+                }
+                continue
+            
+            edits.append((function_start, function_end, function_name))
+            endpoints[function_name] = {
+                'success': True,
+                'message': '成功優化端點',
+                'optimizations': optimization_result['optimizations'],
                 'original_code': function_code,
                 'optimized_code': optimization_result['optimized_code']
             }
         
+        # 嵌套在另一個要優化的端點中的函數會隨外層一起被替換，不再單獨替換
+        edits.sort()
+        applied = []
+        for function_start, function_end, function_name in edits:
+            if applied and function_start < applied[-1][1]:
+                result = endpoints[function_name]
+                endpoints[function_name] = {
+                    'success': False,
+                    'message': f'函數位於端點 {applied[-1][2]} 之中，無法單獨優化',
+                    'original_code': result['original_code'],
+                    'optimized_code': result['optimized_code']
+                }
+                continue
+            applied.append((function_start, function_end, function_name))
+        
+        # 更新文件（由後往前替換）
+        if applied:
+            new_content = content
+            for function_start, function_end, function_name in reversed(applied):
+                optimized_code = endpoints[function_name]['optimized_code']
+                new_content = new_content[:function_start] + optimized_code + new_content[function_end:]
+            
+            if not write_file(file_path, new_content):
+                for _, _, function_name in applied:
+                    result = endpoints[function_name]
+                    endpoints[function_name] = {
+                        'success': False,
+                        'message': '無法寫入優化後的代碼到文件',
+                        'original_code': result['original_code'],
+                        'optimized_code': result['optimized_code']
+                    }
+                applied = []
+        
         return {
-            'success': True,
-            'message': '成功優化端點',
-            'optimizations': optimization_result['optimizations'],
-            'original_code': function_code,
-            'optimized_code': optimization_result['optimized_code']
+            'success': bool(applied),
+            'message': f'成功優化 {len(applied)} 個端點（共 {len(endpoints)} 個）',
+            'endpoints': endpoints
         }
     
     def _optimize_function_code(self, function_code: str, framework: str) -> Dict[str, Any]:
@@ -1244,15 +1709,13 @@ class Config:
             # 檢查並修復 N+1 查詢
             if '.objects.get(' in function_code and 'for ' in function_code and 'select_related' not in function_code:
                 # 簡單的啟發式方法：添加 select_related
-                relation_pattern = r'(\w+)\.objects\.filter\(.*?\)(?:\.\w+\(\))?'
-                relation_match = re.search(relation_pattern, function_code)
+                relation_match = _DJANGO_FILTER_QUERY_RE.search(function_code)
                 
                 if relation_match:
                     model_name = relation_match.group(1)
                     
                     # 查找可能的關係字段
-                    field_pattern = rf'for\s+\w+\s+in\s+.*?:\s*.*?\.(\w+)'
-                    field_match = re.search(field_pattern, function_code, re.DOTALL)
+                    field_match = _LOOP_FIELD_RE.search(function_code)
                     
                     if field_match:
                         relation_field = field_match.group(1)
@@ -1279,8 +1742,7 @@ class Config:
     queryset = paginator.get_page(page)
 '''
                 # 查找並替換 .all() 調用
-                all_pattern = r'(\w+)\s*=\s*.*?\.all\(\)'
-                all_match = re.search(all_pattern, function_code)
+                all_match = _ALL_ASSIGN_RE.search(function_code)
                 
                 if all_match:
                     queryset_var = all_match.group(1)
@@ -1307,15 +1769,13 @@ class Config:
             # 檢查並修復 SQLAlchemy N+1 查詢
             if '.query.' in function_code and 'for ' in function_code and 'joinedload' not in function_code:
                 # 簡單的啟發式方法：添加 joinedload
-                query_pattern = r'(\w+)\.query\.(\w+)\(.*?\)'
-                query_match = re.search(query_pattern, function_code)
+                query_match = _MODEL_QUERY_RE.search(function_code)
                 
                 if query_match:
                     model_name = query_match.group(1)
                     
                     # 查找可能的關係字段
-                    field_pattern = rf'for\s+\w+\s+in\s+.*?:\s*.*?\.(\w+)'
-                    field_match = re.search(field_pattern, function_code, re.DOTALL)
+                    field_match = _LOOP_FIELD_RE.search(function_code)
                     
                     if field_match:
                         relation_field = field_match.group(1)
@@ -1358,8 +1818,7 @@ class Config:
     }
 '''
                 # 查找並替換 .all() 調用
-                all_pattern = r'(\w+)\s*=\s*(.*?)\.all\(\)'
-                all_match = re.search(all_pattern, function_code)
+                all_match = _ALL_ASSIGN_RE.search(function_code)
                 
                 if all_match:
                     items_var = all_match.group(1)
@@ -1385,8 +1844,7 @@ class Config:
             # 檢查並修復異步 N+1 查詢
             if 'async def' in function_code and 'await' in function_code and 'for ' in function_code:
                 # 檢查循環中的 await 調用
-                pattern = r'for\s+\w+\s+in\s+(.*?):\s*.*?await'
-                match = re.search(pattern, function_code, re.DOTALL)
+                match = _LOOP_AWAIT_RE.search(function_code)
                 
                 if match:
                     # 添加批次查詢建議
@@ -1404,18 +1862,14 @@ class Config:
             # 檢查並修復分頁問題
             if '.all()' in function_code and ('limit' not in function_code.lower() and 'skip' not in function_code.lower()):
                 # 將 all() 調用更改為帶有分頁的調用
-                all_replace_pattern = r'(\w+)\s*=\s*(.+?)\.all\(\)'
-                
                 def pagination_replacement(match):
                     var_name = match.group(1)
                     query = match.group(2)
                     return f"{var_name} = {query}.offset(skip).limit(limit)"
                 
-                optimized_code = re.sub(all_replace_pattern, pagination_replacement, optimized_code)
+                optimized_code = _QUERY_ALL_ASSIGN_RE.sub(pagination_replacement, optimized_code)
                 
                 # 添加分頁參數
-                function_def_pattern = r'(async\s+def\s+\w+\s*\()([^)]*?)(\):)'
-                
                 def add_pagination_params(match):
                     prefix = match.group(1)
                     existing_params = match.group(2)
@@ -1427,7 +1881,7 @@ class Config:
                     else:
                         return f"{prefix}skip: int = 0, limit: int = 100{suffix}"
                 
-                optimized_code = re.sub(function_def_pattern, add_pagination_params, optimized_code)
+                optimized_code = _ASYNC_DEF_PARAMS_RE.sub(add_pagination_params, optimized_code)
                 
                 optimizations.append({
                     'type': 'pagination_added',
@@ -1442,12 +1896,29 @@ class Config:
                         optimized_code = optimized_code[:first_line_end + 1] + query_import + optimized_code[first_line_end + 1:]
                 
                 # 更新參數驗證
-                params_pattern = r'(skip: int = 0, limit: int = 100)'
                 validated_params = "skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000)"
-                optimized_code = re.sub(params_pattern, validated_params, optimized_code)
+                optimized_code = _PAGINATION_PARAMS_RE.sub(validated_params, optimized_code)
         
         # 返回優化結果
         return {
             'optimized_code': optimized_code,
             'optimizations': optimizations
-        }
\ No newline at end of file
+        }
+
+
+def _scan_files(task: Tuple[str, str, List[str]]) -> List[Dict[str, List[Dict[str, Any]]]]:
+    """
+    在工作行程中對一組文件執行所有性能檢測
+    
+    文件在工作行程內讀取，行程間只傳遞路徑與檢測出的問題。
+    
+    Args:
+        task: (專案路徑, 框架, 文件路徑列表)
+        
+    Returns:
+        每項檢測的問題，順序與 APIPerformanceOptimizer._run_analysis_steps 相同
+    """
+    project_path, framework, file_paths = task
+    optimizer = APIPerformanceOptimizer(project_path, framework)
+    optimizer._py_files = file_paths
+    return optimizer._run_analysis_steps()
@@ -0,0 +1,433 @@
+"""
+性能問題檢測規則 - API 性能優化器各項檢測所回報問題的固定內容
+"""
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+from .plan_models import dumps_json_bytes
+
+
+@dataclass(slots=True, frozen=True)
+class DetectionRule:
+    """性能問題檢測規則：同一規則的所有問題共用這些唯讀內容"""
+    type: str
+    description: str
+    solution: str
+    severity: str
+    code_example: Optional[str] = None
+    
+    def as_issue(self, file_path: str, **fields: Any) -> Dict[str, Any]:
+        """
+        生成檢測到的問題
+        
+        Args:
+            file_path: 發現問題的文件路徑
+            fields: 填入說明模板的欄位（例如 size、count、endpoint）
+        
+        Returns:
+            問題字典，沒有程式碼範例的規則不含 code_example 鍵
+        """
+        issue = {
+            'type': self.type,
+            'file': file_path,
+            'description': self.description.format(**fields) if fields else self.description,
+            'solution': self.solution,
+            'severity': self.severity
+        }
+        if self.code_example is not None:
+            issue['code_example'] = self.code_example
+        return issue
+
+
+# 所有檢測規則，以規則名稱索引
+RULES: Mapping[str, DetectionRule] = MappingProxyType({
+    # Django N+1 查詢（按循環中出現的查詢區分說明）
+    'django_loop_objects': DetectionRule(
+        type='n_plus_one',
+        description='for 循環中使用 .objects 查詢',
+        solution='使用 select_related 或 prefetch_related 提前獲取關聯數據',
+        severity='high'
+    ),
+    'django_loop_filter': DetectionRule(
+        type='n_plus_one',
+        description='for 循環中使用 .filter 查詢',
+        solution='使用 select_related 或 prefetch_related 提前獲取關聯數據',
+        severity='high'
+    ),
+    'django_loop_get': DetectionRule(
+        type='n_plus_one',
+        description='for 循環中使用 .get() 查詢',
+        solution='使用 select_related 或 prefetch_related 提前獲取關聯數據',
+        severity='high'
+    ),
+    'missing_related_prefetch': DetectionRule(
+        type='missing_related_prefetch',
+        description='使用 ForeignKey 或 ManyToManyField 但未使用 select_related/prefetch_related',
+        solution='使用 select_related 或 prefetch_related 優化關聯查詢',
+        severity='medium'
+    ),
+    
+    # Flask（SQLAlchemy）N+1 查詢
+    'flask_loop_query': DetectionRule(
+        type='n_plus_one',
+        description='for 循環中使用 SQLAlchemy 查詢',
+        solution='使用 joinedload 或 subqueryload 提前獲取關聯數據',
+        severity='high'
+    ),
+    'flask_loop_session_query': DetectionRule(
+        type='n_plus_one',
+        description='for 循環中使用 session.query',
+        solution='使用 joinedload 或 subqueryload 提前獲取關聯數據',
+        severity='high'
+    ),
+    'flask_loop_get': DetectionRule(
+        type='n_plus_one',
+        description='for 循環中使用 .get() 查詢',
+        solution='使用 joinedload 或 subqueryload 提前獲取關聯數據',
+        severity='high'
+    ),
+    'missing_joined_load': DetectionRule(
+        type='missing_joined_load',
+        description='使用關聯關係但未使用 joinedload 或 subqueryload',
+        solution='使用 joinedload 或 subqueryload 優化關聯查詢',
+        severity='medium'
+    ),
+    
+    # FastAPI 異步 N+1 查詢
+    'fastapi_loop_get': DetectionRule(
+        type='async_n_plus_one',
+        description='async 函數的 for 循環中使用 await .get()',
+        solution='使用 selectinload 或批次查詢優化異步查詢',
+        severity='high'
+    ),
+    'fastapi_loop_db': DetectionRule(
+        type='async_n_plus_one',
+        description='async 函數的 for 循環中使用數據庫查詢',
+        solution='使用 selectinload 或批次查詢優化異步查詢',
+        severity='high'
+    ),
+    
+    # 批量操作
+    'individual_creates': DetectionRule(
+        type='individual_creates',
+        description='循環中使用個別的 .objects.create() 而非批量操作',
+        solution='使用 bulk_create() 代替循環中的單獨創建',
+        severity='medium',
+        code_example='''
+# 優化前:
+for item in items:
+    Model.objects.create(field1=item.value1, field2=item.value2)
+
+# 優化後:
+objects_to_create = [Model(field1=item.value1, field2=item.value2) for item in items]
+Model.objects.bulk_create(objects_to_create)
+'''
+    ),
+    'individual_saves': DetectionRule(
+        type='individual_saves',
+        description='循環中使用個別的 .save() 而非批量操作',
+        solution='使用 bulk_update() 代替循環中的單獨更新',
+        severity='medium',
+        code_example='''
+# 優化前:
+for obj in objects:
+    obj.field = new_value
+    obj.save()
+
+# 優化後:
+for obj in objects:
+    obj.field = new_value
+Model.objects.bulk_update(objects, ['field'])
+'''
+    ),
+    'individual_adds': DetectionRule(
+        type='individual_adds',
+        description='循環中使用個別的 session.add() 操作',
+        solution='在循環外執行一次 session.add_all() 和 session.commit()',
+        severity='medium',
+        code_example='''
+# 優化前:
+for item in items:
+    new_obj = Model(field1=item.value1, field2=item.value2)
+    session.add(new_obj)
+    session.commit()
+
+# 優化後:
+objects_to_add = [Model(field1=item.value1, field2=item.value2) for item in items]
+session.add_all(objects_to_add)
+session.commit()
+'''
+    ),
+    'multiple_commits': DetectionRule(
+        type='multiple_commits',
+        description='循環中執行多次 flush/commit 操作',
+        solution='在循環外批量執行一次 commit',
+        severity='high',
+        code_example='''
+# 優化前:
+for item in items:
+    new_obj = Model(field1=item.value1, field2=item.value2)
+    session.add(new_obj)
+    session.commit()  # 每次迭代都提交事務
+
+# 優化後:
+for item in items:
+    new_obj = Model(field1=item.value1, field2=item.value2)
+    session.add(new_obj)
+session.commit()  # 循環結束後執行一次提交
+'''
+    ),
+    
+    # 序列化
+    'serializer_depth': DetectionRule(
+        type='serializer_depth',
+        description='使用序列化器的 depth 參數可能導致過度序列化',
+        solution='考慮使用嵌套序列化器並明確指定要包含的欄位，而非使用通用 depth',
+        severity='medium'
+    ),
+    'uncached_method_field': DetectionRule(
+        type='uncached_method_field',
+        description='使用 SerializerMethodField 但沒有緩存計算結果',
+        solution='考慮使用 @cached_property 裝飾器緩存 get_* 方法的結果',
+        severity='low',
+        code_example='''
+# 優化前:
+def get_calculated_field(self, obj):
+    # 執行複雜計算
+    return complex_calculation(obj)
+
+# 優化後:
+@cached_property
+def get_calculated_field(self, obj):
+    # 執行複雜計算
+    return complex_calculation(obj)
+'''
+    ),
+    'excessive_serialization': DetectionRule(
+        type='excessive_serialization',
+        description='使用 fields = "__all__" 可能導致過度序列化，包含不必要的欄位',
+        solution='明確指定僅需要的欄位列表，而非使用 "__all__"',
+        severity='medium',
+        code_example='''
+# 優化前:
+class UserSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = '__all__'
+
+# 優化後:
+class UserSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'email', 'profile']  # 只包含必要欄位
+'''
+    ),
+    'uncached_property': DetectionRule(
+        type='uncached_property',
+        description='使用未緩存的計算屬性可能導致序列化期間重複計算',
+        solution='考慮使用 functools.cached_property 緩存計算結果',
+        severity='low',
+        code_example='''
+# 優化前:
+@property
+def full_name(self) -> str:
+    return f"{self.first_name} {self.last_name}"
+
+# 優化後:
+from functools import cached_property
+
+@cached_property
+def full_name(self) -> str:
+    return f"{self.first_name} {self.last_name}"
+'''
+    ),
+    'excessive_nested_models': DetectionRule(
+        type='excessive_nested_models',
+        description='檢測到大量嵌套的 Pydantic 模型 ({count})，可能導致過度序列化',
+        solution='考慮拆分模型或使用回應模型減少不必要的欄位',
+        severity='medium'
+    ),
+    
+    # 分頁
+    'django_missing_pagination': DetectionRule(
+        type='missing_pagination',
+        description='列表視圖缺少分頁，可能導致大型資料集的性能問題',
+        solution='添加分頁類以限制回應大小',
+        severity='high',
+        code_example='''
+# settings.py
+REST_FRAMEWORK = {
+    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'PAGE_SIZE': 100
+}
+
+# 或在視圖中指定
+class MyListView(ListAPIView):
+    pagination_class = PageNumberPagination
+    page_size = 100
+'''
+    ),
+    'large_page_size': DetectionRule(
+        type='large_page_size',
+        description='過大的分頁大小 ({size})，可能導致資料傳輸和處理延遲',
+        solution='將分頁大小減少到合理範圍（通常為 20-100）',
+        severity='medium'
+    ),
+    'flask_missing_pagination': DetectionRule(
+        type='missing_pagination',
+        description='直接返回 .query.all() 結果而沒有分頁',
+        solution='實施分頁以限制回應大小',
+        severity='high',
+        code_example='''
+# 優化前:
+@app.route('/api/items')
+def get_items():
+    items = Item.query.all()
+    return jsonify([item.to_dict() for item in items])
+
+# 優化後:
+@app.route('/api/items')
+def get_items():
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', 20, type=int), 100)  # 限制最大頁面大小
+    pagination = Item.query.paginate(page=page, per_page=per_page, error_out=False)
+    
+    return jsonify({
+        'items': [item.to_dict() for item in pagination.items],
+        'total': pagination.total,
+        'pages': pagination.pages,
+        'page': page
+    })
+'''
+    ),
+    'fastapi_missing_pagination': DetectionRule(
+        type='missing_pagination',
+        description='端點 {endpoint} 返回所有結果而沒有分頁',
+        solution='使用查詢參數實施分頁',
+        severity='high',
+        code_example='''
+# 優化前:
+@app.get("/items/")
+async def read_items():
+    items = db.query(Item).all()
+    return items
+
+# 優化後:
+@app.get("/items/")
+async def read_items(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    items = db.query(Item).offset(skip).limit(limit).all()
+    return items
+'''
+    ),
+    
+    # 回應大小
+    'unfiltered_all': DetectionRule(
+        type='large_response',
+        description='使用 .all() 檢索所有記錄，可能導致大量數據傳輸',
+        solution='使用分頁、適當的篩選或欄位選擇限制回應大小',
+        severity='medium'
+    ),
+    'unfiltered_find': DetectionRule(
+        type='large_response',
+        description='使用空篩選查詢所有文檔，可能導致大量數據傳輸',
+        solution='使用分頁、適當的篩選或欄位選擇限制回應大小',
+        severity='medium'
+    ),
+    'unfiltered_select': DetectionRule(
+        type='large_response',
+        description='使用沒有篩選的 select()，可能導致大量數據傳輸',
+        solution='使用分頁、適當的篩選或欄位選擇限制回應大小',
+        severity='medium'
+    ),
+    'nested_response_generation': DetectionRule(
+        type='nested_response_generation',
+        description='使用嵌套列表推導式生成回應，可能導致性能問題',
+        solution='考慮優化資料結構或使用資料庫層面的連接',
+        severity='medium'
+    ),
+    'excessive_joins': DetectionRule(
+        type='excessive_joins',
+        description='使用過多的級聯關係（__）可能導致複雜的 SQL 連接',
+        solution='減少查詢中的關聯層次或分解為多個查詢',
+        severity='medium'
+    )
+})
+
+
+# 程式碼範例，以規則名稱索引；序列化報告時每個範例只輸出一次
+CODE_EXAMPLES: Mapping[str, str] = MappingProxyType({
+    name: rule.code_example for name, rule in RULES.items() if rule.code_example is not None
+})
+
+# 由範例文字反查規則名稱
+_EXAMPLE_IDS: Dict[str, str] = {example: name for name, example in CODE_EXAMPLES.items()}
+
+
+def dumps_report(result: Mapping[str, Any], indent: bool = False) -> str:
+    """
+    將性能分析結果或優化建議序列化為 JSON 字串
+    
+    Args:
+        result: analyze_api_performance 或 generate_optimization_recommendations 的結果
+        indent: 是否以兩個空格縮排輸出
+        
+    Returns:
+        JSON 字串（非 ASCII 字元保持原樣）
+    """
+    return dumps_report_bytes(result, indent).decode('utf-8')
+
+
+def dumps_report_bytes(result: Mapping[str, Any], indent: bool = False) -> bytes:
+    """
+    將性能分析結果或優化建議序列化為 UTF-8 編碼的 JSON
+    
+    問題字典在記憶體中只引用規則的程式碼範例，但直接序列化會把同一範例
+    重複編碼到每一筆問題；這裡將來自規則的範例改為 code_example_id，
+    範例全文集中輸出在頂層的 code_examples 中。不屬於任何規則的範例
+    （例如建議中的自訂範例）原樣保留。序列化與升級計劃共用 dumps_json_bytes。
+    
+    Args:
+        result: analyze_api_performance 或 generate_optimization_recommendations 的結果
+        indent: 是否以兩個空格縮排輸出
+        
+    Returns:
+        UTF-8 編碼的 JSON（非 ASCII 字元不轉義）
+    """
+    report = {}
+    used = {}
+    for key, value in result.items():
+        if isinstance(value, list):
+            value = [_with_example_id(item, used) for item in value]
+        report[key] = value
+    if used:
+        report['code_examples'] = used
+    
+    return dumps_json_bytes(report, indent)
+
+
+def _with_example_id(item: Any, used: Dict[str, str]) -> Any:
+    """
+    將項目中來自規則的程式碼範例替換為範例名稱
+    
+    Args:
+        item: 問題或建議
+        used: 已引用的範例，以範例名稱索引（會被更新）
+        
+    Returns:
+        替換後的項目；沒有規則範例的項目原樣返回
+    """
+    if not isinstance(item, dict):
+        return item
+    example = item.get('code_example')
+    example_id = _EXAMPLE_IDS.get(example) if isinstance(example, str) else None
+    if example_id is None:
+        return item
+    
+    used[example_id] = example
+    item = {('code_example_id' if key == 'code_example' else key): value for key, value in item.items()}
+    item['code_example_id'] = example_id
+    return item
@@ -0,0 +1,168 @@
+"""
+升級計劃模型 - 版本與身份驗證升級計劃中升級階段、客戶端更改與回滾步驟的唯讀模板
+"""
+import dataclasses
+import json
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+try:
+    import orjson
+except ImportError:
+    # orjson 為可選依賴，不可用時退回標準庫 json
+    orjson = None
+
+
+def fill_template(text: str, current_version: str, target_version: str) -> str:
+    """
+    將模板中的版本佔位符替換為實際版本
+    
+    模板以 {cv} 代表當前版本、{tv} 代表目標版本。
+    
+    Args:
+        text: 模板文字
+        current_version: 當前版本
+        target_version: 目標版本
+    
+    Returns:
+        替換後的文字，不含佔位符的文字原樣返回
+    """
+    if '{' not in text:
+        return text
+    return text.format(cv=current_version, tv=target_version)
+
+
+@dataclass(slots=True, frozen=True)
+class UpgradePhase:
+    """升級階段模板"""
+    name: str
+    description: str
+    tasks: Tuple[str, ...]
+    
+    def as_dict(self, current_version: str, target_version: str) -> Dict[str, Any]:
+        """
+        以實際版本生成升級階段
+        
+        Args:
+            current_version: 當前版本
+            target_version: 目標版本
+        
+        Returns:
+            升級階段的字典
+        """
+        return {
+            'name': fill_template(self.name, current_version, target_version),
+            'description': fill_template(self.description, current_version, target_version),
+            'tasks': [fill_template(task, current_version, target_version) for task in self.tasks]
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class ClientChange:
+    """客戶端遷移指南中的更改模板"""
+    type: str
+    description: str
+    migration_action: str
+    
+    def as_dict(self, current_version: str, target_version: str) -> Dict[str, Any]:
+        """
+        以實際版本生成更改說明
+        
+        Args:
+            current_version: 當前版本
+            target_version: 目標版本
+        
+        Returns:
+            更改說明的字典
+        """
+        return {
+            'type': self.type,
+            'description': fill_template(self.description, current_version, target_version),
+            'migration_action': self.migration_action
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class RollbackStep:
+    """回滾步驟模板"""
+    step: str
+    description: str
+    responsible: str
+    
+    def as_dict(self, current_version: str, target_version: str) -> Dict[str, Any]:
+        """
+        以實際版本生成回滾步驟
+        
+        Args:
+            current_version: 當前版本
+            target_version: 目標版本
+        
+        Returns:
+            回滾步驟的字典
+        """
+        return {
+            'step': self.step,
+            'description': fill_template(self.description, current_version, target_version),
+            'responsible': self.responsible
+        }
+
+
+def _json_default(obj: Any) -> Any:
+    """
+    將唯讀結構與資料類別轉換為可序列化的內建型別
+    
+    Args:
+        obj: 序列化器無法直接處理的物件
+        
+    Returns:
+        對應的 dict 或 list
+    """
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, (Sequence, set, frozenset)) and not isinstance(obj, (str, bytes)):
+        return list(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def dumps_json_bytes(obj: Any, indent: bool = False) -> bytes:
+    """
+    將計劃、報告等結果序列化為 UTF-8 編碼的 JSON
+    
+    可處理唯讀映射、tuple、frozenset 與資料類別；安裝了 orjson 時使用
+    orjson，否則使用標準庫 json，輸出內容一致。
+    
+    Args:
+        obj: 要序列化的物件
+        indent: 是否以兩個空格縮排輸出
+        
+    Returns:
+        UTF-8 編碼的 JSON（非 ASCII 字元不轉義）
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_json_default, option=option)
+    
+    if indent:
+        text = json.dumps(obj, default=_json_default, ensure_ascii=False, indent=2)
+    else:
+        text = json.dumps(obj, default=_json_default, ensure_ascii=False, separators=(',', ':'))
+    return text.encode('utf-8')
+
+
+def dumps_plan(plan: Mapping[str, Any], indent: bool = False) -> str:
+    """
+    將升級計劃、遷移指南或版本控制狀態序列化為 JSON 字串
+    
+    Args:
+        plan: 要序列化的計劃
+        indent: 是否以兩個空格縮排輸出
+        
+    Returns:
+        JSON 字串（非 ASCII 字元保持原樣）
+    """
+    return dumps_json_bytes(plan, indent).decode('utf-8')
@@ -5,6 +5,12 @@ import logging
 import os
 from typing import List, Optional
 
+# 遍歷專案時略過的目錄（版本控制、虛擬環境、建置產物與工具快取）
+SKIP_DIRS = frozenset({
+    '.git', '.hg', '.svn', '__pycache__', '.venv', 'venv', 'env', 'node_modules',
+    'build', 'dist', '.tox', '.mypy_cache', '.pytest_cache', 'site-packages', '.eggs'
+})
+
 
 def read_file(file_path: str) -> Optional[str]:
     """